@@ -10,6 +10,10 @@ from routes.loan import loan_bp
 from routes.startup import startup_bp
 from routes.competitor import competitor_bp
 from routes.sec_lookup import sec_lookup_bp
+from routes.jobs import jobs_bp
+from services.sec_lookup import sec_lookup_service
+from services.extraction_cache import extraction_cache
+from services.response_formatter import ResponseFormatter
 
 
 def create_app():
@@ -37,6 +41,9 @@ def create_app():
     app.register_blueprint(startup_bp)
     app.register_blueprint(competitor_bp)
     app.register_blueprint(sec_lookup_bp)
+    app.register_blueprint(jobs_bp)
+
+    sec_lookup_service.warm_up()
 
     @app.route('/health', methods=['GET'])
     def health_check():
@@ -47,6 +54,13 @@ def create_app():
             'version': '1.0.0'
         })
 
+    @app.route('/extraction-cache/stats', methods=['GET'])
+    def extraction_cache_stats():
+        """Size and limits of the on-disk cache of extracted upload text"""
+        if extraction_cache is None:
+            return ResponseFormatter.success_response(data={"enabled": False})
+        return ResponseFormatter.success_response(data={"enabled": True, **extraction_cache.stats()})
+
     return app
 
 
@@ -0,0 +1,67 @@
+"""
+Per-query latency of company name matching against the full SEC ticker list.
+
+Compares the previous approach (three process.extract passes over the raw
+choices) with CompanyMatcher's shortlist-then-score pass.
+
+    python -m benchmarks.bench_company_lookup [--repeat 20]
+"""
+import argparse
+import statistics
+import time
+from rapidfuzz import process, fuzz
+from services.sec_lookup import sec_lookup_service
+
+QUERIES = [
+    "mictosoft", "berkshire", "alphabet", "nvidia corporation", "jp morgan",
+    "coca cola", "tesla motors", "senseonics", "walmart", "appel",
+    "exxon mobil", "goldman", "procter gamble", "johnson and johnson",
+]
+
+
+def three_pass_extract(query, choices):
+    all_matches = {}
+    for scorer in (fuzz.WRatio, fuzz.partial_ratio, fuzz.token_sort_ratio):
+        for name, score, _ in process.extract(query, choices, scorer=scorer, limit=10):
+            all_matches[name] = max(all_matches.get(name, 0), score)
+    return sorted(all_matches.items(), key=lambda x: x[1], reverse=True)[:5]
+
+
+def time_per_query(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        for query in QUERIES:
+            start = time.perf_counter()
+            fn(query)
+            samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(label, samples):
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{label:<28} mean {statistics.mean(samples):7.2f} ms   p50 {statistics.median(samples):7.2f} ms   p95 {p95:7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    sec_lookup_service.warm_up()
+    index = sec_lookup_service._index
+    matcher = index.matcher
+    choices = [str(choice) for choice in matcher.choices]
+    print(f"{len(choices):,} choices, {len(QUERIES)} queries x {args.repeat} runs\n")
+
+    report("three-pass process.extract", time_per_query(lambda q: three_pass_extract(q, choices), args.repeat))
+    report("CompanyMatcher.match", time_per_query(lambda q: matcher.match(q), args.repeat))
+
+    print()
+    for query in QUERIES:
+        best = matcher.match(query, limit=1)
+        print(f"{query:<22} -> {best[0][0] if best else '-'}")
+
+
+if __name__ == "__main__":
+    main()
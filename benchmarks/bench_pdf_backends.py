@@ -0,0 +1,91 @@
+"""
+Throughput and text fidelity of the installed PDF backends over a corpus of PDFs.
+
+Each backend extracts every page of every PDF in-process (no worker pool), so
+timings compare the libraries rather than the parallel path. Fidelity is the
+word-level F1 against a reference: a sibling ``<name>.txt`` ground-truth file
+when one exists, otherwise the PyPDF2 output.
+
+    python -m benchmarks.bench_pdf_backends path/to/corpus [--repeat 3] [--backends pypdf pypdfium2]
+"""
+import argparse
+import glob
+import os
+import statistics
+import time
+from collections import Counter
+from services.pdf_backends import DEFAULT_PDF_BACKEND, available_backends, get_pdf_backend
+from services.text_extractor import TextExtractor, _extract_pdf_pages
+
+
+def extract(backend, file_path):
+    document = backend.open(file_path)
+    try:
+        pages = _extract_pdf_pages(backend, document, 0, len(backend.pages(document)), 0)
+    finally:
+        backend.close(document)
+    return len(pages), TextExtractor._clean_text("".join(text + "\n" for _, text in pages if text))
+
+
+def word_f1(text, reference):
+    words, expected = Counter(text.split()), Counter(reference.split())
+    overlap = sum((words & expected).values())
+    if not overlap:
+        return 0.0
+    precision = overlap / sum(words.values())
+    recall = overlap / sum(expected.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def reference_text(file_path, baseline):
+    truth_path = os.path.splitext(file_path)[0] + ".txt"
+    if os.path.exists(truth_path):
+        with open(truth_path, "r", encoding="utf-8", errors="ignore") as f:
+            return TextExtractor._clean_text(f.read())
+    return extract(baseline, file_path)[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("corpus", help="Directory of sample PDFs")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--backends", nargs="+", default=None)
+    args = parser.parse_args()
+
+    files = sorted(glob.glob(os.path.join(args.corpus, "**", "*.pdf"), recursive=True))
+    if not files:
+        parser.error(f"No PDFs found under {args.corpus}")
+
+    backends = args.backends or available_backends()
+    baseline = get_pdf_backend(DEFAULT_PDF_BACKEND)
+    references = {path: reference_text(path, baseline) for path in files}
+    total_mb = sum(os.path.getsize(path) for path in files) / (1024 * 1024)
+    print(f"{len(files)} PDFs, {total_mb:.1f} MB, {args.repeat} runs per backend\n")
+
+    for name in backends:
+        if name not in available_backends():
+            print(f"{name:<12} not installed")
+            continue
+        backend = get_pdf_backend(name)
+
+        samples = []
+        fidelity = []
+        page_total = 0
+        for path in files:
+            for run in range(args.repeat):
+                start = time.perf_counter()
+                page_count, text = extract(backend, path)
+                samples.append(time.perf_counter() - start)
+            page_total += page_count
+            fidelity.append(word_f1(text, references[path]))
+
+        seconds = sum(samples) / args.repeat
+        print(
+            f"{name:<12} {seconds:8.2f} s/corpus   {page_total / seconds:8.1f} pages/s   "
+            f"{total_mb / seconds:6.2f} MB/s   p50 {statistics.median(samples) * 1000:8.1f} ms/file   "
+            f"word F1 {statistics.mean(fidelity):.3f} (min {min(fidelity):.3f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -18,6 +18,51 @@ class Config:
 
     MAX_CONTENT_LENGTH = 50 * 1024 * 1024
 
+    UPLOAD_EXTRACT_WORKERS = int(os.getenv("UPLOAD_EXTRACT_WORKERS", 0))
+    UPLOAD_SPOOL_MAX_BYTES = int(os.getenv("UPLOAD_SPOOL_MAX_BYTES", 8 * 1024 * 1024))
+
+    PDF_BACKEND = os.getenv("PDF_BACKEND", "pypdf2")
+    PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", 0))
+    PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", 32))
+    PDF_PAGE_TIMEOUT = float(os.getenv("PDF_PAGE_TIMEOUT", 20))
+
+    EXCEL_STREAMING_MIN_BYTES = int(os.getenv("EXCEL_STREAMING_MIN_BYTES", 1024 * 1024))
+    EXCEL_MAX_ROWS = int(os.getenv("EXCEL_MAX_ROWS", 100_000))
+    EXCEL_MAX_CHARS = int(os.getenv("EXCEL_MAX_CHARS", 10_000_000))
+
+    EXTRACTION_CACHE_ENABLED = os.getenv("EXTRACTION_CACHE_ENABLED", "True").lower() == "true"
+    EXTRACTION_CACHE_DIR = os.getenv("EXTRACTION_CACHE_DIR", "cache/extraction")
+    EXTRACTION_CACHE_MAX_BYTES = int(os.getenv("EXTRACTION_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+    EXTRACTION_CACHE_TTL = float(os.getenv("EXTRACTION_CACHE_TTL", 7 * 24 * 3600))
+
+    FINANCIAL_FILTER_ENABLED = os.getenv("FINANCIAL_FILTER_ENABLED", "True").lower() == "true"
+    FINANCIAL_FILTER_MIN_CHARS = int(os.getenv("FINANCIAL_FILTER_MIN_CHARS", 30_000))
+    FINANCIAL_SECTION_CONTEXT = int(os.getenv("FINANCIAL_SECTION_CONTEXT", 1))
+    FINANCIAL_SECTION_MIN_SCORE = float(os.getenv("FINANCIAL_SECTION_MIN_SCORE", 0.2))
+    FINANCIAL_CHUNKED_MIN_CHARS = int(os.getenv("FINANCIAL_CHUNKED_MIN_CHARS", 150_000))
+    FINANCIAL_CHUNK_CHARS = int(os.getenv("FINANCIAL_CHUNK_CHARS", 80_000))
+    FINANCIAL_CHUNK_WORKERS = int(os.getenv("FINANCIAL_CHUNK_WORKERS", 4))
+
+    JOB_BACKEND = os.getenv("JOB_BACKEND", "sqlite").lower()
+    JOB_DB_PATH = os.getenv("JOB_DB_PATH", "cache/jobs.sqlite3")
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", 4))
+    JOB_MAX_PENDING = int(os.getenv("JOB_MAX_PENDING", 64))
+    JOB_RESULT_TTL = int(os.getenv("JOB_RESULT_TTL", 24 * 60 * 60))
+
+    SEC_CACHE_DIR = os.getenv("SEC_CACHE_DIR", "cache/sec")
+    SEC_FACTS_TTL = int(os.getenv("SEC_FACTS_TTL", 24 * 60 * 60))
+    SEC_TICKERS_TTL = int(os.getenv("SEC_TICKERS_TTL", 7 * 24 * 60 * 60))
+    SEC_STALE_TTL = int(os.getenv("SEC_STALE_TTL", 7 * 24 * 60 * 60))
+    SEC_REQUESTS_PER_SECOND = float(os.getenv("SEC_REQUESTS_PER_SECOND", 10))
+    SEC_MAX_RETRIES = int(os.getenv("SEC_MAX_RETRIES", 3))
+    SEC_RETRY_AFTER_MAX = float(os.getenv("SEC_RETRY_AFTER_MAX", 120))
+    SEC_LLM_FALLBACK_SCORE = int(os.getenv("SEC_LLM_FALLBACK_SCORE", 70))
+    SEC_LOOKUP_CACHE_SIZE = int(os.getenv("SEC_LOOKUP_CACHE_SIZE", 1024))
+    SEC_LOOKUP_CACHE_TTL = int(os.getenv("SEC_LOOKUP_CACHE_TTL", 60 * 60))
+    SEC_BATCH_MAX_NAMES = int(os.getenv("SEC_BATCH_MAX_NAMES", 50))
+    SEC_BATCH_WORKERS = int(os.getenv("SEC_BATCH_WORKERS", 8))
+    SEC_LLM_BATCH_WORKERS = int(os.getenv("SEC_LLM_BATCH_WORKERS", 4))
+
     @classmethod
     def ensure_directories(cls):
         os.makedirs(cls.UPLOAD_FOLDER, exist_ok=True)
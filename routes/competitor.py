@@ -1,7 +1,6 @@
 from flask import Blueprint, request
 import json
-from services.file_service import FileService
-from services.text_extractor import TextExtractor
+from services.upload_pipeline import UploadPipeline
 from services.gemini_service import GeminiFinancialExtractor
 from services.response_formatter import ResponseFormatter
 from services.error_handler import ErrorHandler, handle_exceptions
@@ -11,6 +10,48 @@ competitor_bp = Blueprint("competitor", __name__)
 
 gemini_extractor = GeminiFinancialExtractor()
 
+SEC_METRIC_LABELS = (
+    ("revenue", "Revenues", "Revenue"),
+    ("net_income", "NetIncomeLoss", "Net Income"),
+    ("total_assets", "TotalAssets", "Total Assets"),
+    ("total_liabilities", "TotalLiabilities", "Total Liabilities"),
+    ("cash_and_equivalents", "CashAndCashEquivalents", "Cash & Equivalents"),
+)
+SEC_HISTORY_YEARS = 5
+SEC_HISTORY_QUARTERS = 4
+
+
+def format_sec_data_text(sec_data):
+    """Render a /lookup-company result as prompt text: latest metrics plus annual and recent quarterly history"""
+    text = "--- SEC FINANCIAL DATA ---\n\n"
+    text += f"Company: {sec_data.get('company_name', 'Unknown')}\n"
+    if sec_data.get('ticker'):
+        text += f"Ticker: {sec_data['ticker']}\n"
+    text += f"CIK: {sec_data.get('cik', 'Unknown')}\n\n"
+
+    financials = sec_data.get('financials', {})
+    text += "FINANCIAL METRICS:\n"
+    for key, _, label in SEC_METRIC_LABELS:
+        if financials.get(key):
+            text += f"{label}: ${financials[key]:,.2f}\n"
+    text += "\n"
+
+    history = financials.get('history') or {}
+    for frequency, limit, title in (
+        ("annual", SEC_HISTORY_YEARS, "ANNUAL HISTORY (10-K)"),
+        ("quarterly", SEC_HISTORY_QUARTERS, "QUARTERLY HISTORY"),
+    ):
+        lines = []
+        for _, metric, label in SEC_METRIC_LABELS:
+            periods = list(history.get(metric, {}).get(frequency, {}).items())[-limit:]
+            if periods:
+                values = " | ".join(f"{period}: ${item['value']:,.0f}" for period, item in periods)
+                lines.append(f"{label}: {values}\n")
+        if lines:
+            text += f"{title}:\n" + "".join(lines) + "\n"
+
+    return text
+
 @competitor_bp.route("/competitor-analyze", methods=["POST"])
 @handle_exceptions
 def analyze_competitors():
@@ -35,43 +76,10 @@ def analyze_competitors():
         combined_text = ""
 
         if company_sec_data:
-            combined_text += "--- SEC FINANCIAL DATA ---\n\n"
-            combined_text += f"Company: {company_sec_data.get('company_name', 'Unknown')}\n"
-            if company_sec_data.get('ticker'):
-                combined_text += f"Ticker: {company_sec_data['ticker']}\n"
-            combined_text += f"CIK: {company_sec_data.get('cik', 'Unknown')}\n\n"
-
-            financials = company_sec_data.get('financials', {})
-            combined_text += "FINANCIAL METRICS:\n"
-            if financials.get('revenue'):
-                combined_text += f"Revenue: ${financials['revenue']:,.2f}\n"
-            if financials.get('net_income'):
-                combined_text += f"Net Income: ${financials['net_income']:,.2f}\n"
-            if financials.get('total_assets'):
-                combined_text += f"Total Assets: ${financials['total_assets']:,.2f}\n"
-            if financials.get('total_liabilities'):
-                combined_text += f"Total Liabilities: ${financials['total_liabilities']:,.2f}\n"
-            if financials.get('cash_and_equivalents'):
-                combined_text += f"Cash & Equivalents: ${financials['cash_and_equivalents']:,.2f}\n"
-            combined_text += "\n"
-
-        for file in uploaded_files:
-            if file.filename == "":
-                continue
-
-            filepath, filename = FileService.save_uploaded_file(file)
-            processed_files.append({
-                "filename": filename,
-                "filepath": filepath
-            })
-
-            extracted_text = TextExtractor.extract_text_from_file(filepath)
-
-            if combined_text:
-                combined_text += f"\n\n--- FILE: {filename} ---\n\n"
-            else:
-                combined_text += f"--- FILE: {filename} ---\n\n"
-            combined_text += extracted_text
+            combined_text += format_sec_data_text(company_sec_data)
+
+        processed_files = UploadPipeline.process_files(uploaded_files)
+        combined_text = UploadPipeline.combine_text(processed_files, combined_text=combined_text)
 
         if not combined_text.strip():
             return ErrorHandler.validation_error("No readable content found for analysis")
@@ -84,16 +92,14 @@ def analyze_competitors():
                 "error": "Gemini API not configured. Please set GEMINI_API_KEY environment variable.",
             }
 
-        return ResponseFormatter.format_competitor_response(competitor_result)
+        return ResponseFormatter.format_competitor_response(
+            competitor_result, file_timings=UploadPipeline.file_timings(processed_files)
+        )
 
     except Exception as e:
         return ErrorHandler.processing_error(str(e))
     finally:
-        for file_info in processed_files:
-            try:
-                FileService.cleanup_file(file_info["filepath"])
-            except:
-                pass
+        UploadPipeline.cleanup(processed_files)
 
 
 @competitor_bp.route("/competitor-compare", methods=["POST"])
@@ -131,84 +137,22 @@ def compare_companies():
         company_a_text = ""
 
         if company_a_sec_data:
-            company_a_text += "--- SEC FINANCIAL DATA ---\n\n"
-            company_a_text += f"Company: {company_a_sec_data.get('company_name', 'Unknown')}\n"
-            if company_a_sec_data.get('ticker'):
-                company_a_text += f"Ticker: {company_a_sec_data['ticker']}\n"
-            company_a_text += f"CIK: {company_a_sec_data.get('cik', 'Unknown')}\n\n"
-
-            financials = company_a_sec_data.get('financials', {})
-            company_a_text += "FINANCIAL METRICS:\n"
-            if financials.get('revenue'):
-                company_a_text += f"Revenue: ${financials['revenue']:,.2f}\n"
-            if financials.get('net_income'):
-                company_a_text += f"Net Income: ${financials['net_income']:,.2f}\n"
-            if financials.get('total_assets'):
-                company_a_text += f"Total Assets: ${financials['total_assets']:,.2f}\n"
-            if financials.get('total_liabilities'):
-                company_a_text += f"Total Liabilities: ${financials['total_liabilities']:,.2f}\n"
-            if financials.get('cash_and_equivalents'):
-                company_a_text += f"Cash & Equivalents: ${financials['cash_and_equivalents']:,.2f}\n"
-            company_a_text += "\n"
-
-        for file in company_a_files:
-            if file.filename == "":
-                continue
-
-            filepath, filename = FileService.save_uploaded_file(file)
-            processed_files.append({
-                "filename": filename,
-                "filepath": filepath
-            })
-
-            extracted_text = TextExtractor.extract_text_from_file(filepath)
-
-            if company_a_text:
-                company_a_text += f"\n\n--- FILE: {filename} ---\n\n"
-            else:
-                company_a_text += f"--- FILE: {filename} ---\n\n"
-            company_a_text += extracted_text
+            company_a_text += format_sec_data_text(company_a_sec_data)
+
+        # Both companies' files are extracted in one pool, then split back apart
+        company_a_uploads = [file for file in company_a_files if file.filename != ""]
+        processed_files = UploadPipeline.process_files(company_a_uploads + company_b_files)
+        company_a_files_info = processed_files[:len(company_a_uploads)]
+        company_b_files_info = processed_files[len(company_a_uploads):]
+
+        company_a_text = UploadPipeline.combine_text(company_a_files_info, combined_text=company_a_text)
 
         company_b_text = ""
 
         if company_b_sec_data:
-            company_b_text += "--- SEC FINANCIAL DATA ---\n\n"
-            company_b_text += f"Company: {company_b_sec_data.get('company_name', 'Unknown')}\n"
-            if company_b_sec_data.get('ticker'):
-                company_b_text += f"Ticker: {company_b_sec_data['ticker']}\n"
-            company_b_text += f"CIK: {company_b_sec_data.get('cik', 'Unknown')}\n\n"
-
-            financials = company_b_sec_data.get('financials', {})
-            company_b_text += "FINANCIAL METRICS:\n"
-            if financials.get('revenue'):
-                company_b_text += f"Revenue: ${financials['revenue']:,.2f}\n"
-            if financials.get('net_income'):
-                company_b_text += f"Net Income: ${financials['net_income']:,.2f}\n"
-            if financials.get('total_assets'):
-                company_b_text += f"Total Assets: ${financials['total_assets']:,.2f}\n"
-            if financials.get('total_liabilities'):
-                company_b_text += f"Total Liabilities: ${financials['total_liabilities']:,.2f}\n"
-            if financials.get('cash_and_equivalents'):
-                company_b_text += f"Cash & Equivalents: ${financials['cash_and_equivalents']:,.2f}\n"
-            company_b_text += "\n"
-
-        for file in company_b_files:
-            if file.filename == "":
-                continue
-
-            filepath, filename = FileService.save_uploaded_file(file)
-            processed_files.append({
-                "filename": filename,
-                "filepath": filepath
-            })
-
-            extracted_text = TextExtractor.extract_text_from_file(filepath)
-
-            if company_b_text:
-                company_b_text += f"\n\n--- FILE: {filename} ---\n\n"
-            else:
-                company_b_text += f"--- FILE: {filename} ---\n\n"
-            company_b_text += extracted_text
+            company_b_text += format_sec_data_text(company_b_sec_data)
+
+        company_b_text = UploadPipeline.combine_text(company_b_files_info, combined_text=company_b_text)
 
         if not company_a_text.strip() or not company_b_text.strip():
             return ErrorHandler.validation_error("No readable content found for one or both companies")
@@ -221,16 +165,14 @@ def compare_companies():
                 "error": "Gemini API not configured. Please set GEMINI_API_KEY environment variable.",
             }
 
-        return ResponseFormatter.format_comparison_response(comparison_result)
+        return ResponseFormatter.format_comparison_response(
+            comparison_result, file_timings=UploadPipeline.file_timings(processed_files)
+        )
 
     except Exception as e:
         return ErrorHandler.processing_error(str(e))
     finally:
-        for file_info in processed_files:
-            try:
-                FileService.cleanup_file(file_info["filepath"])
-            except:
-                pass
+        UploadPipeline.cleanup(processed_files)
 
 
 @competitor_bp.route("/competitor-lookup", methods=["POST"])
@@ -1,6 +1,8 @@
 from flask import Blueprint, request
-from services.file_service import FileService
+from config import Config
 from services.text_extractor import TextExtractor
+from services.upload_pipeline import UploadPipeline
+from services.job_queue import run_or_submit
 from services.gemini_service import GeminiFinancialExtractor
 from services.response_formatter import ResponseFormatter
 from services.error_handler import ErrorHandler, handle_exceptions
@@ -26,59 +28,53 @@ def evaluate():
         return ErrorHandler.validation_error("No files uploaded")
 
     processed_files = []
-    combined_text = ""
-    total_length = 0
 
     try:
-        for file in uploaded_files:
-            if file.filename == "":
-                continue
-
-            filepath, filename = FileService.save_uploaded_file(file)
-            extracted_text = TextExtractor.extract_text_from_file(filepath)
-
-            processed_files.append(
-                {
-                    "filename": filename,
-                    "filepath": filepath,
-                    "text_length": len(extracted_text),
-                    "text": extracted_text,
-                }
-            )
+        # Only statement-like sections (plus a little context) go to the LLM; each
+        # file is reduced as it is extracted, so full texts are never held together
+        processed_files = UploadPipeline.process_files(
+            uploaded_files,
+            select=TextExtractor.select_financial_text if Config.FINANCIAL_FILTER_ENABLED else None,
+        )
 
-            if combined_text:
-                combined_text += f"\n\n--- FILE: {filename} ---\n\n"
-            else:
-                combined_text += f"--- FILE: {filename} ---\n\n"
+        for file_info in processed_files:
+            if len(file_info["text"]) < file_info["text_length"]:
+                print(
+                    f"Financial section filter: {file_info['filename']} "
+                    f"{file_info['text_length']} -> {len(file_info['text'])} characters"
+                )
 
-            combined_text += extracted_text
-            total_length += len(extracted_text)
+        combined_text = UploadPipeline.combine_text(processed_files)
+        total_length = sum(f["text_length"] for f in processed_files)
 
         if not processed_files:
             return ErrorHandler.validation_error("No valid files to process")
 
-        if gemini_extractor:
-            financial_analysis = gemini_extractor.extract_financial_data(combined_text)
-        else:
-            financial_analysis = {
-                "success": False,
-                "error": "Gemini API not configured. Please set GEMINI_API_KEY environment variable.",
-            }
         filenames = [f["filename"] for f in processed_files]
+        file_timings = UploadPipeline.file_timings(processed_files)
 
-        return ResponseFormatter.format_evaluation_response(
-            filename=f"{len(filenames)} files: " + ", ".join(filenames),
-            text_length=total_length,
-            financial_analysis=financial_analysis,
-            file_count=len(processed_files),
-            processed_files=filenames,
-        )
+        # Files are fully extracted by now, so the LLM call can run as a queued job
+        def analyze():
+            if gemini_extractor:
+                financial_analysis = gemini_extractor.extract_financial_data(combined_text)
+            else:
+                financial_analysis = {
+                    "success": False,
+                    "error": "Gemini API not configured. Please set GEMINI_API_KEY environment variable.",
+                }
+
+            return ResponseFormatter.format_evaluation_response(
+                filename=f"{len(filenames)} files: " + ", ".join(filenames),
+                text_length=total_length,
+                financial_analysis=financial_analysis,
+                file_count=len(filenames),
+                processed_files=filenames,
+                file_timings=file_timings,
+            )
+
+        return run_or_submit("evaluate", analyze)
 
     except Exception as e:
         return ErrorHandler.processing_error(str(e))
     finally:
-        for file_info in processed_files:
-            try:
-                FileService.cleanup_file(file_info["filepath"])
-            except:
-                pass
+        UploadPipeline.cleanup(processed_files)
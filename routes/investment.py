@@ -1,7 +1,7 @@
 from flask import Blueprint, request
 import json
-from services.file_service import FileService
-from services.text_extractor import TextExtractor
+from services.upload_pipeline import UploadPipeline
+from services.job_queue import run_or_submit
 from services.gemini_service import GeminiFinancialExtractor
 from services.openrouter_service import OpenRouterService
 from services.response_formatter import ResponseFormatter
@@ -33,33 +33,11 @@ def analyze_investment_files():
         return ErrorHandler.validation_error("No files uploaded")
 
     processed_files = []
-    combined_text = ""
-    total_length = 0
 
     try:
-        for file in uploaded_files:
-            if file.filename == "":
-                continue
-
-            filepath, filename = FileService.save_uploaded_file(file)
-            extracted_text = TextExtractor.extract_text_from_file(filepath)
-
-            processed_files.append(
-                {
-                    "filename": filename,
-                    "filepath": filepath,
-                    "text_length": len(extracted_text),
-                    "text": extracted_text,
-                }
-            )
-
-            if combined_text:
-                combined_text += f"\n\n--- INVESTMENT FILE: {filename} ---\n\n"
-            else:
-                combined_text += f"--- INVESTMENT FILE: {filename} ---\n\n"
-
-            combined_text += extracted_text
-            total_length += len(extracted_text)
+        processed_files = UploadPipeline.process_files(uploaded_files)
+        combined_text = UploadPipeline.combine_text(processed_files, label="INVESTMENT FILE")
+        total_length = sum(f["text_length"] for f in processed_files)
 
         if not processed_files:
             return ErrorHandler.validation_error("No valid files to process")
@@ -82,16 +60,13 @@ def analyze_investment_files():
             investment_analysis=investment_analysis,
             file_count=len(processed_files),
             processed_files=filenames,
+            file_timings=UploadPipeline.file_timings(processed_files),
         )
 
     except Exception as e:
         return ErrorHandler.processing_error(str(e))
     finally:
-        for file_info in processed_files:
-            try:
-                FileService.cleanup_file(file_info["filepath"])
-            except:
-                pass
+        UploadPipeline.cleanup(processed_files)
 
 
 @investment_bp.route("/investment-analyze-text", methods=["POST"])
@@ -146,28 +121,8 @@ def check_investment_sufficiency():
         if is_multipart or (request.files and "files" in request.files):
             if request.files and "files" in request.files:
                 uploaded_files = request.files.getlist("files")
-
-                for file in uploaded_files:
-                    if file.filename == "":
-                        continue
-
-                    filepath, filename = FileService.save_uploaded_file(file)
-                    extracted_text = TextExtractor.extract_text_from_file(filepath)
-
-                    processed_files.append(
-                        {
-                            "filename": filename,
-                            "filepath": filepath,
-                            "text_length": len(extracted_text),
-                        }
-                    )
-
-                    if combined_text:
-                        combined_text += f"\n\n--- NEW FILE: {filename} ---\n\n"
-                    else:
-                        combined_text += f"--- NEW FILE: {filename} ---\n\n"
-
-                    combined_text += extracted_text
+                processed_files = UploadPipeline.process_files(uploaded_files)
+                combined_text = UploadPipeline.combine_text(processed_files, label="NEW FILE")
 
             manual_text = request.form.get("manual_text", "").strip()
 
@@ -246,11 +201,7 @@ def check_investment_sufficiency():
     except Exception as e:
         return ErrorHandler.processing_error(str(e))
     finally:
-        for file_info in processed_files:
-            try:
-                FileService.cleanup_file(file_info["filepath"])
-            except:
-                pass
+        UploadPipeline.cleanup(processed_files)
 
 
 @investment_bp.route("/investment-calculate-validity", methods=["POST"])
@@ -272,26 +223,8 @@ def calculate_investment_validity():
 
             if request.files and "files" in request.files:
                 uploaded_files = request.files.getlist("files")
-
-                for file in uploaded_files:
-                    if file.filename == "":
-                        continue
-
-                    filepath, filename = FileService.save_uploaded_file(file)
-                    extracted_text = TextExtractor.extract_text_from_file(filepath)
-
-                    processed_files.append({
-                        "filename": filename,
-                        "filepath": filepath,
-                        "text_length": len(extracted_text),
-                    })
-
-                    if additional_file_text:
-                        additional_file_text += f"\n\n--- ADDITIONAL FILE: {filename} ---\n\n"
-                    else:
-                        additional_file_text += f"--- ADDITIONAL FILE: {filename} ---\n\n"
-
-                    additional_file_text += extracted_text
+                processed_files = UploadPipeline.process_files(uploaded_files)
+                additional_file_text = UploadPipeline.combine_text(processed_files, label="ADDITIONAL FILE")
 
             try:
                 financial_data_str = request.form.get("financial_data")
@@ -339,26 +272,25 @@ def calculate_investment_validity():
             print(f"DEBUG VALIDITY: Added {len(processed_files)} additional files")
             print(f"DEBUG VALIDITY: Additional content length: {len(additional_file_text):,} characters")
 
-        if openrouter_service:
-            validity_result = openrouter_service.calculate_investment_validity(
-                financial_data, valuation_data, investment_data
-            )
-        else:
-            validity_result = {
-                "success": False,
-                "error": "OpenRouter API not configured. Please set OPENROUTER_API_KEY environment variable.",
-            }
+        def calculate():
+            if openrouter_service:
+                validity_result = openrouter_service.calculate_investment_validity(
+                    financial_data, valuation_data, investment_data
+                )
+            else:
+                validity_result = {
+                    "success": False,
+                    "error": "OpenRouter API not configured. Please set OPENROUTER_API_KEY environment variable.",
+                }
 
-        return ResponseFormatter.format_validity_response(validity_result)
+            return ResponseFormatter.format_validity_response(validity_result)
+
+        return run_or_submit("investment-calculate-validity", calculate)
 
     except Exception as e:
         return ErrorHandler.processing_error(str(e))
     finally:
-        for file_info in processed_files:
-            try:
-                FileService.cleanup_file(file_info["filepath"])
-            except:
-                pass
+        UploadPipeline.cleanup(processed_files)
 
 
 @investment_bp.route("/investment-calculate-validity-fast", methods=["POST"])
@@ -380,26 +312,8 @@ def calculate_investment_validity_fast():
 
             if request.files and "files" in request.files:
                 uploaded_files = request.files.getlist("files")
-
-                for file in uploaded_files:
-                    if file.filename == "":
-                        continue
-
-                    filepath, filename = FileService.save_uploaded_file(file)
-                    extracted_text = TextExtractor.extract_text_from_file(filepath)
-
-                    processed_files.append({
-                        "filename": filename,
-                        "filepath": filepath,
-                        "text_length": len(extracted_text),
-                    })
-
-                    if additional_file_text:
-                        additional_file_text += f"\n\n--- ADDITIONAL FILE: {filename} ---\n\n"
-                    else:
-                        additional_file_text += f"--- ADDITIONAL FILE: {filename} ---\n\n"
-
-                    additional_file_text += extracted_text
+                processed_files = UploadPipeline.process_files(uploaded_files)
+                additional_file_text = UploadPipeline.combine_text(processed_files, label="ADDITIONAL FILE")
 
             try:
                 financial_data_str = request.form.get("financial_data")
@@ -462,11 +376,7 @@ def calculate_investment_validity_fast():
     except Exception as e:
         return ErrorHandler.processing_error(str(e))
     finally:
-        for file_info in processed_files:
-            try:
-                FileService.cleanup_file(file_info["filepath"])
-            except:
-                pass
+        UploadPipeline.cleanup(processed_files)
 
 
 @investment_bp.route("/investment-find-investors", methods=["POST"])
@@ -488,26 +398,8 @@ def find_investors():
 
             if request.files and "files" in request.files:
                 uploaded_files = request.files.getlist("files")
-
-                for file in uploaded_files:
-                    if file.filename == "":
-                        continue
-
-                    filepath, filename = FileService.save_uploaded_file(file)
-                    extracted_text = TextExtractor.extract_text_from_file(filepath)
-
-                    processed_files.append({
-                        "filename": filename,
-                        "filepath": filepath,
-                        "text_length": len(extracted_text),
-                    })
-
-                    if additional_file_text:
-                        additional_file_text += f"\n\n--- ADDITIONAL FILE: {filename} ---\n\n"
-                    else:
-                        additional_file_text += f"--- ADDITIONAL FILE: {filename} ---\n\n"
-
-                    additional_file_text += extracted_text
+                processed_files = UploadPipeline.process_files(uploaded_files)
+                additional_file_text = UploadPipeline.combine_text(processed_files, label="ADDITIONAL FILE")
 
             try:
                 financial_data_str = request.form.get("financial_data")
@@ -569,8 +461,4 @@ def find_investors():
     except Exception as e:
         return ErrorHandler.processing_error(str(e))
     finally:
-        for file_info in processed_files:
-            try:
-                FileService.cleanup_file(file_info["filepath"])
-            except:
-                pass
+        UploadPipeline.cleanup(processed_files)
@@ -0,0 +1,25 @@
+from flask import Blueprint
+from services.job_queue import get_job_queue
+from services.response_formatter import ResponseFormatter
+from services.error_handler import ErrorHandler
+
+jobs_bp = Blueprint("jobs", __name__)
+
+
+@jobs_bp.route("/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    """
+    Status of a job queued with ?async=true. Once it has finished, "result" holds
+    the response body the endpoint would have returned directly.
+    """
+    job = get_job_queue().get(job_id)
+    if job is None:
+        return ErrorHandler.create_error_response(f"Job not found: {job_id}", 404, "not_found")
+
+    return ResponseFormatter.format_job_response(job)
+
+
+@jobs_bp.route("/jobs/stats", methods=["GET"])
+def job_stats():
+    """Pending job count and limits of this process's job queue"""
+    return ResponseFormatter.success_response(data=get_job_queue().stats())
@@ -1,9 +1,13 @@
+import os
+import click
 from flask import Blueprint, request, jsonify
+from config import Config
 from services.sec_lookup import sec_lookup_service
+from services.sec_bulk_ingest import bulk_ingest, download_archive
 from services.error_handler import ErrorHandler
 from services.response_formatter import ResponseFormatter
 
-sec_lookup_bp = Blueprint('sec_lookup', __name__)
+sec_lookup_bp = Blueprint('sec_lookup', __name__, cli_group='sec')
 
 @sec_lookup_bp.route('/lookup-company', methods=['POST'])
 def lookup_company():
@@ -21,7 +25,8 @@ def lookup_company():
         "success": bool,
         "data": {
             "company_name": str,
-            "ticker": str, 
+            "ticker": str,
+            "tickers": [str],
             "cik": str,
             "financials": {...},
             "match_score": int
@@ -49,6 +54,54 @@ def lookup_company():
     except Exception as e:
         return ErrorHandler.processing_error(f"SEC lookup failed: {str(e)}")
 
+@sec_lookup_bp.route('/lookup-companies', methods=['POST'])
+def lookup_companies():
+    """
+    Look up several companies by name/ticker in one request
+
+    Request body:
+    {
+        "company_names": [str],
+        "threshold": int (optional, default 75)
+    }
+
+    Response:
+    {
+        "success": bool,
+        "results": [
+            {"query": str, ...same fields as /lookup-company}
+        ] (in input order)
+    }
+    """
+    try:
+        data = request.get_json()
+
+        if not data or not isinstance(data.get('company_names'), list):
+            return ErrorHandler.validation_error("company_names must be a list")
+
+        company_names = [str(name).strip() for name in data['company_names']]
+        if not company_names or not all(company_names):
+            return ErrorHandler.validation_error("Company names cannot be empty")
+
+        if len(company_names) > Config.SEC_BATCH_MAX_NAMES:
+            return ErrorHandler.validation_error(
+                f"At most {Config.SEC_BATCH_MAX_NAMES} companies can be looked up per request"
+            )
+
+        threshold = data.get('threshold', 75)
+
+        results = sec_lookup_service.lookup_companies(company_names, threshold)
+
+        return jsonify({
+            "success": True,
+            "results": [
+                {"query": name, **result} for name, result in zip(company_names, results)
+            ],
+        })
+
+    except Exception as e:
+        return ErrorHandler.processing_error(f"SEC batch lookup failed: {str(e)}")
+
 @sec_lookup_bp.route('/select-company', methods=['POST'])
 def select_company():
     """
@@ -75,3 +128,50 @@ def select_company():
 
     except Exception as e:
         return ErrorHandler.processing_error(f"Company selection failed: {str(e)}")
+
+
+@sec_lookup_bp.route('/lookup-company/cache-stats', methods=['GET'])
+def lookup_cache_stats():
+    """Hit/miss counters for the in-process company lookup cache"""
+    return ResponseFormatter.success_response(data=sec_lookup_service.lookup_cache.stats())
+
+
+@sec_lookup_bp.cli.command('ingest')
+@click.argument('ciks', nargs=-1)
+def ingest_company_facts(ciks):
+    """Reduce cached companyfacts files into the compact financials store"""
+    count = sec_lookup_service.ingest_cached_company_facts(list(ciks) or None)
+    click.echo(f"Ingested {count} companies into the financials store")
+
+
+@sec_lookup_bp.cli.command('migrate-cache')
+def migrate_cache():
+    """Rewrite pretty-printed SEC cache files as compressed entries tracked in the manifest"""
+    stats = sec_lookup_service.cache.migrate()
+    click.echo(
+        f"Migrated {stats['migrated']} entries: "
+        f"{stats['bytes_before']:,} bytes -> {stats['bytes_after']:,} bytes"
+    )
+
+
+@sec_lookup_bp.cli.command('bulk-ingest')
+@click.option('--archive', 'archive_path', default=None, help='Local companyfacts.zip (default: <cache>/companyfacts.zip)')
+@click.option('--download/--no-download', default=False, help="Fetch SEC's nightly companyfacts.zip first")
+@click.option('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+def bulk_ingest_company_facts(archive_path, download, workers):
+    """Populate the financials store from SEC's bulk companyfacts.zip archive"""
+    archive_path = archive_path or os.path.join(sec_lookup_service.cache_dir, 'companyfacts.zip')
+
+    if download:
+        click.echo(f"Downloading companyfacts.zip to {archive_path}")
+        download_archive(archive_path)
+    elif not os.path.exists(archive_path):
+        raise click.UsageError(f"{archive_path} not found; pass --archive or --download")
+
+    stats = bulk_ingest(
+        archive_path,
+        sec_lookup_service.financials_store,
+        workers=workers,
+        progress=lambda done, total: click.echo(f"  batch {done}/{total}"),
+    )
+    click.echo(f"Ingested {stats['ingested']} of {stats['members']} companies ({stats['skipped']} skipped)")
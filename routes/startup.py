@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify
 from services.gemini_service import GeminiFinancialExtractor
 from services.response_formatter import ResponseFormatter
 from services.error_handler import ErrorHandler, handle_exceptions
+from services.job_queue import run_or_submit
 import json
 
 startup_bp = Blueprint("startup", __name__)
@@ -27,18 +28,21 @@ def analyze_startup():
         if not startup_description:
             return ErrorHandler.validation_error("Startup description is required")
 
-        if gemini_extractor:
-            analysis_result = gemini_extractor.analyze_startup(
-                startup_description,
-                flags
-            )
-        else:
-            analysis_result = {
-                "success": False,
-                "error": "Gemini API not configured. Please set GEMINI_API_KEY environment variable.",
-            }
-
-        return ResponseFormatter.format_startup_response(analysis_result)
+        def analyze():
+            if gemini_extractor:
+                analysis_result = gemini_extractor.analyze_startup(
+                    startup_description,
+                    flags
+                )
+            else:
+                analysis_result = {
+                    "success": False,
+                    "error": "Gemini API not configured. Please set GEMINI_API_KEY environment variable.",
+                }
+
+            return ResponseFormatter.format_startup_response(analysis_result)
+
+        return run_or_submit("startup-analyze", analyze)
 
     except Exception as e:
         return ErrorHandler.processing_error(str(e))
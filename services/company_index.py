@@ -0,0 +1,196 @@
+import os
+import json
+import numpy as np
+from typing import Optional, Dict, Any, List
+from .company_matcher import CompanyMatcher, normalize_company_name, build_trigram_index
+
+
+class CompanyIndex:
+    """
+    Prebuilt on-disk index over SEC company_tickers.json.
+
+    The index is a set of sorted numpy arrays (.npy) that are memory-mapped
+    read-only, so every worker process shares the same page-cache copy instead
+    of parsing the JSON and building its own dicts. Lookups use binary search.
+    The fuzzy matcher's normalized names and trigram postings are stored the
+    same way, so no process re-normalizes the list or rebuilds the trigram index.
+    """
+
+    ARRAYS = (
+        "titles", "tickers", "ciks",
+        "name_keys", "name_ciks",
+        "ticker_keys", "ticker_ciks",
+        "cik_keys", "cik_rows",
+        "match_choices", "match_normalized",
+        "gram_keys", "gram_offsets", "postings", "title_lengths",
+    )
+    TRIGRAM_ARRAYS = ("gram_keys", "gram_offsets", "postings", "title_lengths")
+    META_NAME = "meta.json"
+    VERSION = 3
+
+    def __init__(self, index_dir: str):
+        self.index_dir = index_dir
+        self._arrays = None
+        self._matcher = None
+        self._titles = None
+
+    def _array_path(self, name: str) -> str:
+        return os.path.join(self.index_dir, f"{name}.npy")
+
+    def _meta_path(self) -> str:
+        return os.path.join(self.index_dir, self.META_NAME)
+
+    def built_from(self) -> Optional[float]:
+        """fetched_at of the company_tickers.json payload the index on disk was built from.
+
+        Returns None when there is no index or it was written by an older layout."""
+        try:
+            with open(self._meta_path(), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if meta.get("version") != self.VERSION:
+            return None
+        return meta.get("source_fetched_at")
+
+    def build(self, raw: Dict[str, Any], source_fetched_at: Optional[float] = None) -> None:
+        """Write the index arrays for a company_tickers.json payload"""
+        os.makedirs(self.index_dir, exist_ok=True)
+
+        titles = []
+        tickers = []
+        ciks = []
+        for v in raw.values():
+            titles.append(str(v.get("title", "")).strip())
+            tickers.append(str(v.get("ticker", "")).strip())
+            ciks.append(int(str(v.get("cik_str", "0")).strip() or 0))
+
+        titles = np.array(titles, dtype=str)
+        tickers = np.array(tickers, dtype=str)
+        ciks = np.array(ciks, dtype=np.int64)
+
+        name_keys = np.char.lower(titles)
+        name_order = np.argsort(name_keys, kind="stable")
+
+        ticker_keys = np.char.upper(tickers)
+        has_ticker = np.flatnonzero(ticker_keys != "")
+        ticker_order = has_ticker[np.argsort(ticker_keys[has_ticker], kind="stable")]
+
+        # Stable sort keeps each issuer's rows in file order, so the first row
+        # of a CIK's range is its primary listing
+        cik_order = np.argsort(ciks, kind="stable")
+
+        # Fuzzy matching choices: every title, then every non-empty ticker
+        match_choices = np.concatenate([titles, tickers[tickers != ""]])
+        match_normalized = np.array([normalize_company_name(c) for c in match_choices.tolist()], dtype=str)
+        trigram_index = build_trigram_index(match_normalized[:len(titles)].tolist())
+
+        arrays = {
+            "titles": titles,
+            "tickers": tickers,
+            "ciks": ciks,
+            "name_keys": name_keys[name_order],
+            "name_ciks": ciks[name_order],
+            "ticker_keys": ticker_keys[ticker_order],
+            "ticker_ciks": ciks[ticker_order],
+            "cik_keys": ciks[cik_order],
+            "cik_rows": cik_order.astype(np.int64),
+            "match_choices": match_choices,
+            "match_normalized": match_normalized,
+            **trigram_index,
+        }
+
+        for name, array in arrays.items():
+            tmp_path = f"{self._array_path(name)}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, array)
+            os.replace(tmp_path, self._array_path(name))
+
+        # Written last so a half-built index is never considered current
+        tmp_meta = f"{self._meta_path()}.{os.getpid()}.tmp"
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": self.VERSION,
+                "source_fetched_at": source_fetched_at,
+                "count": int(len(ciks)),
+            }, f)
+        os.replace(tmp_meta, self._meta_path())
+
+        self._arrays = None
+        self._matcher = None
+        self._titles = None
+
+    def load(self) -> None:
+        """Memory-map the index arrays (read-only, shared copy-on-write across workers)"""
+        self._arrays = {
+            name: np.load(self._array_path(name), mmap_mode="r")
+            for name in self.ARRAYS
+        }
+        self._matcher = None
+        self._titles = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._arrays is not None
+
+    def _search(self, keys_name: str, ciks_name: str, key: str) -> Optional[str]:
+        keys = self._arrays[keys_name]
+        pos = int(np.searchsorted(keys, key))
+        if pos < len(keys) and keys[pos] == key:
+            return str(self._arrays[ciks_name][pos])
+        return None
+
+    def cik_for_ticker(self, ticker: str) -> Optional[str]:
+        if not ticker:
+            return None
+        return self._search("ticker_keys", "ticker_ciks", ticker.strip().upper())
+
+    def cik_for_name(self, name: str) -> Optional[str]:
+        if not name:
+            return None
+        return self._search("name_keys", "name_ciks", name.strip().lower())
+
+    def _rows_for_cik(self, cik: str) -> np.ndarray:
+        keys = self._arrays["cik_keys"]
+        cik = int(cik)
+        start = int(np.searchsorted(keys, cik, side="left"))
+        end = int(np.searchsorted(keys, cik, side="right"))
+        return self._arrays["cik_rows"][start:end]
+
+    def tickers_for_cik(self, cik: str) -> List[str]:
+        """Every ticker listed for a CIK (share classes, preferreds, units), primary first"""
+        tickers = self._arrays["tickers"]
+        return [str(tickers[row]) for row in self._rows_for_cik(cik) if tickers[row]]
+
+    def record_for_cik(self, cik: str) -> Optional[Dict[str, Any]]:
+        """Company record for a CIK: title, primary ticker and all tickers"""
+        rows = self._rows_for_cik(cik)
+        if len(rows) == 0:
+            return None
+
+        tickers = self.tickers_for_cik(cik)
+        return {
+            "title": str(self._arrays["titles"][rows[0]]),
+            "ticker": tickers[0] if tickers else "",
+            "tickers": tickers,
+            "cik": str(int(cik)),
+        }
+
+    @property
+    def titles(self) -> List[str]:
+        if self._titles is None:
+            self._titles = self._arrays["titles"].tolist()
+        return self._titles
+
+    @property
+    def matcher(self) -> CompanyMatcher:
+        """Fuzzy matcher over titles and tickers, backed by the memory-mapped matcher arrays"""
+        if self._matcher is None:
+            self._matcher = CompanyMatcher.from_arrays(
+                self._arrays["match_choices"],
+                len(self._arrays["titles"]),
+                self._arrays["match_normalized"],
+                {name: self._arrays[name] for name in self.TRIGRAM_ARRAYS},
+            )
+        return self._matcher
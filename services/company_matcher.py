@@ -0,0 +1,268 @@
+import re
+import numpy as np
+from rapidfuzz import process, fuzz
+from typing import Dict, List, Tuple, Optional, Sequence
+
+LEGAL_SUFFIXES = {
+    "inc", "incorporated", "corp", "corporation", "co", "company", "cos",
+    "ltd", "limited", "llc", "plc", "lp", "llp", "sa", "ag", "nv", "bv", "se",
+    "de", "md", "new",
+}
+
+# Common names that share nothing with the SEC registrant title, mapped to the
+# issuer's primary ticker (tickers are more stable than SEC title spellings)
+COMPANY_ALIASES = {
+    "google": "GOOGL",
+    "youtube": "GOOGL",
+    "facebook": "META",
+    "instagram": "META",
+    "whatsapp": "META",
+    "jp morgan": "JPM",
+    "jpmorgan": "JPM",
+    "chase": "JPM",
+    "coca cola": "KO",
+    "at t": "T",
+    "att": "T",
+    "amazon": "AMZN",
+    "aws": "AMZN",
+    "p g": "PG",
+    "procter and gamble": "PG",
+    "j j": "JNJ",
+    "johnson and johnson": "JNJ",
+    "hewlett packard": "HPQ",
+    "exxon": "XOM",
+    "berkshire": "BRK-B",
+    "bofa": "BAC",
+    "bank of america": "BAC",
+    "wells fargo": "WFC",
+    "disney": "DIS",
+    "pepsi": "PEP",
+    "mcdonalds": "MCD",
+    "citi": "C",
+    "citibank": "C",
+    "amex": "AXP",
+    "verizon": "VZ",
+    "comcast": "CMCSA",
+    "costco": "COST",
+    "snapchat": "SNAP",
+    "fedex": "FDX",
+    "3m": "MMM",
+    "goldman": "GS",
+    "goldman sachs": "GS",
+    "walmart": "WMT",
+    "visa": "V",
+    "mastercard": "MA",
+    "paypal": "PYPL",
+    "t mobile": "TMUS",
+    "bristol myers": "BMY",
+    "lilly": "LLY",
+    "eli lilly": "LLY",
+    "unitedhealth": "UNH",
+    "lockheed": "LMT",
+    "boeing": "BA",
+    "intel": "INTC",
+    "cisco": "CSCO",
+    "oracle": "ORCL",
+    "netflix": "NFLX",
+    "airbnb": "ABNB",
+    "starbucks": "SBUX",
+    "nike": "NKE",
+    "marlboro": "MO",
+    "altria": "MO",
+    "philip morris": "PM",
+    "kraft": "KHC",
+    "tsmc": "TSM",
+    "toyota": "TM",
+    "square": "XYZ",
+    "cash app": "XYZ",
+    "priceline": "BKNG",
+    "alibaba": "BABA",
+}
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def _trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def normalize_company_name(name: str) -> str:
+    """Lowercase, strip punctuation and drop trailing legal-form suffixes ("Inc", "Corp", "/DE/")"""
+    tokens = _NON_ALNUM.sub(" ", name.lower()).split()
+
+    if tokens and tokens[0] == "the":
+        tokens = tokens[1:]
+    while len(tokens) > 1 and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+
+    return " ".join(tokens)
+
+
+def resolve_alias(query: str) -> Optional[str]:
+    """Ticker for a curated common name ("Google" -> GOOGL), or None"""
+    return COMPANY_ALIASES.get(normalize_company_name(query))
+
+
+def build_trigram_index(normalized_titles: Sequence[str]) -> Dict[str, np.ndarray]:
+    """
+    Inverted index trigram -> title ids as flat arrays, so it can be saved and
+    memory-mapped: sorted gram_keys, gram_offsets into postings, and title_lengths
+    """
+    grams = {}
+    for i, name in enumerate(normalized_titles):
+        for gram in _trigrams(name):
+            grams.setdefault(gram, []).append(i)
+
+    gram_keys = sorted(grams)
+    offsets = np.zeros(len(gram_keys) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(grams[gram]) for gram in gram_keys])
+    postings = np.fromiter(
+        (i for gram in gram_keys for i in grams[gram]), dtype=np.int32, count=int(offsets[-1])
+    )
+
+    return {
+        "gram_keys": np.array(gram_keys, dtype="<U3"),
+        "gram_offsets": offsets,
+        "postings": postings,
+        "title_lengths": np.fromiter(
+            (len(n) for n in normalized_titles), dtype=np.int32, count=len(normalized_titles)
+        ),
+    }
+
+
+class CompanyMatcher:
+    """
+    Fuzzy matcher over company titles and tickers.
+
+    Choices are normalized once and titles are indexed by character trigram;
+    both can be precomputed and memory-mapped (see from_arrays).
+    Each query is shortlisted with a cheap vectorized ratio pass plus trigram
+    containment (which catches partial names and typos), and only the shortlist
+    is scored with the expensive WRatio / partial / token scorers.
+    Tickers are only ever scored with plain ratio, since partial scorers let
+    short tickers match fragments of unrelated names.
+    """
+
+    def __init__(self, titles: List[str], tickers: List[str], shortlist_size: int = 64):
+        choices = list(titles) + list(tickers)
+        normalized = [normalize_company_name(c) for c in choices]
+        self._setup(choices, len(titles), normalized, build_trigram_index(normalized[:len(titles)]), shortlist_size)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        choices: Sequence[str],
+        title_count: int,
+        normalized: Sequence[str],
+        trigram_index: Dict[str, np.ndarray],
+        shortlist_size: int = 64,
+    ) -> "CompanyMatcher":
+        """Matcher over precomputed (e.g. memory-mapped) choices, normalized names and trigram index"""
+        matcher = cls.__new__(cls)
+        matcher._setup(choices, title_count, normalized, trigram_index, shortlist_size)
+        return matcher
+
+    def _setup(self, choices, title_count, normalized, trigram_index, shortlist_size) -> None:
+        self.choices = choices
+        self.title_count = title_count
+        self.normalized = normalized
+        self.shortlist_size = shortlist_size
+        self._gram_keys = trigram_index["gram_keys"]
+        self._gram_offsets = trigram_index["gram_offsets"]
+        self._postings = trigram_index["postings"]
+        self._title_lengths = trigram_index["title_lengths"]
+        self._normalized_list = None
+
+    @property
+    def normalized_list(self) -> List[str]:
+        """Normalized choices as a list: rapidfuzz scores a list several times faster than an array"""
+        if self._normalized_list is None:
+            self._normalized_list = [str(name) for name in self.normalized]
+        return self._normalized_list
+
+    def _trigram_candidates(self, query: str) -> List[int]:
+        """Titles containing the most query trigrams, shortest first among ties"""
+        grams = list(_trigrams(query))
+        positions = np.searchsorted(self._gram_keys, grams)
+        slices = [
+            (self._gram_offsets[pos], self._gram_offsets[pos + 1])
+            for gram, pos in zip(grams, positions.tolist())
+            if pos < len(self._gram_keys) and self._gram_keys[pos] == gram
+        ]
+        if not slices:
+            return []
+
+        hits = np.concatenate([self._postings[start:end] for start, end in slices])
+        counts = np.bincount(hits, minlength=self.title_count)
+
+        k = min(self.shortlist_size, self.title_count)
+        top = np.argpartition(counts, -k)[-k:]
+        top = top[counts[top] * 2 >= len(grams)]
+        order = np.lexsort((self._title_lengths[top], -counts[top]))
+        return top[order].tolist()
+
+    def _shortlist(self, query: str, ratio_scores: Optional[np.ndarray] = None) -> List[int]:
+        if ratio_scores is None:
+            ratio_scores = process.cdist([query], self.normalized_list, scorer=fuzz.ratio, dtype=np.uint8, workers=-1)[0]
+        k = min(self.shortlist_size, len(ratio_scores))
+        candidates = set(np.argpartition(ratio_scores, -k)[-k:].tolist())
+
+        # Partial names ("berkshire" for "Berkshire Hathaway") score poorly on
+        # plain ratio; trigram containment picks them up
+        candidates.update(self._trigram_candidates(query))
+
+        return sorted(candidates)
+
+    def resolve_alias(self, query: str) -> Optional[str]:
+        return resolve_alias(query)
+
+    def match(self, query: str, limit: int = 5) -> List[Tuple[str, float, int]]:
+        """Return (choice, score, index) tuples, best first, scored as the max over all scorers"""
+        return self.match_many([query], limit)[0]
+
+    def match_many(self, queries: List[str], limit: int = 5) -> List[List[Tuple[str, float, int]]]:
+        """match() for several queries, sharing one vectorized ratio pass over all choices"""
+        normalized_queries = [normalize_company_name(q) for q in queries]
+        pending = [i for i, q in enumerate(normalized_queries) if q]
+        results = [[] for _ in queries]
+        if not pending:
+            return results
+
+        ratio_matrix = process.cdist(
+            [normalized_queries[i] for i in pending], self.normalized_list,
+            scorer=fuzz.ratio, dtype=np.uint8, workers=-1,
+        )
+        for row, i in enumerate(pending):
+            shortlist = self._shortlist(normalized_queries[i], ratio_matrix[row])
+            results[i] = self._score_shortlist(normalized_queries[i], shortlist, limit)
+
+        return results
+
+    def _score_shortlist(self, normalized_query: str, shortlist: List[int], limit: int) -> List[Tuple[str, float, int]]:
+        shortlist_names = [self.normalized_list[i] for i in shortlist]
+
+        lengths = np.fromiter((len(n) for n in shortlist_names), dtype=np.int64, count=len(shortlist_names))
+        is_ticker = np.asarray(shortlist) >= self.title_count
+
+        best = np.zeros(len(shortlist))
+        for scorer in (fuzz.WRatio, fuzz.partial_ratio, fuzz.token_sort_ratio):
+            scores = process.cdist([normalized_query], shortlist_names, scorer=scorer, workers=-1)[0]
+            if scorer is fuzz.partial_ratio:
+                # Only reward the query being a fragment of the choice, not the other way round
+                scores = np.where(lengths >= len(normalized_query), scores, 0)
+            np.maximum(best, scores, out=best)
+
+        ratio_scores = process.cdist([normalized_query], shortlist_names, scorer=fuzz.ratio, workers=-1)[0]
+        best = np.where(is_ticker, ratio_scores, best)
+
+        # Titles and tickers often normalize to the same string; keep the best per choice
+        results = {}
+        for pos in np.argsort(-best, kind="stable"):
+            choice = str(self.choices[shortlist[pos]])
+            if choice not in results:
+                results[choice] = (choice, float(best[pos]), shortlist[pos])
+            if len(results) >= limit:
+                break
+
+        return list(results.values())
@@ -0,0 +1,135 @@
+import os
+import time
+import gzip
+import json
+import hashlib
+import threading
+from typing import Optional, Dict, Any, List, Union
+from config import Config
+
+
+class ExtractionCache:
+    """
+    Disk cache of extracted text chunks, keyed by the SHA-256 of the uploaded
+    bytes plus everything that shapes the output (extractor version, file type,
+    backend settings), so re-uploading a document skips parsing entirely.
+
+    Entries are gzip-compressed JSON holding the documents' text, so they are
+    deleted once older than ttl seconds (counted from when they were written; 0
+    keeps them until evicted). Hits refresh the entry's atime, and writes evict
+    least recently used entries once the directory exceeds max_bytes.
+    """
+
+    SUFFIX = ".json.gz"
+
+    def __init__(self, cache_dir: str, max_bytes: int, ttl: float = 0, compresslevel: int = 6):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.compresslevel = compresslevel
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def content_hash(source: Union[str, bytes], block_size: int = 1024 * 1024) -> str:
+        """SHA-256 of a file, given its path or its bytes"""
+        if isinstance(source, bytes):
+            return hashlib.sha256(source).hexdigest()
+
+        digest = hashlib.sha256()
+        with open(source, "rb") as f:
+            for block in iter(lambda: f.read(block_size), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def key_for(self, source: Union[str, bytes], variant: str) -> str:
+        """Cache key for a file's bytes under an extractor variant (version + settings)"""
+        variant_hash = hashlib.sha256(variant.encode("utf-8")).hexdigest()[:16]
+        return f"{self.content_hash(source)}-{variant_hash}"
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}{self.SUFFIX}")
+
+    def _expired(self, mtime: float, now: float) -> bool:
+        return self.ttl > 0 and now - mtime > self.ttl
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        path = self._path(key)
+        try:
+            written = os.stat(path).st_mtime
+            now = time.time()
+            if self._expired(written, now):
+                os.remove(path)
+                return None
+
+            with gzip.open(path, "rb") as f:
+                chunks = json.loads(f.read())
+            # Record the access in atime only; mtime stays the write time the ttl counts from
+            os.utime(path, (now, written))
+            return chunks
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, EOFError) as e:
+            print(f"Warning: Ignoring unreadable extraction cache entry {key}: {e}")
+            return None
+
+    def set(self, key: str, chunks: List[Dict[str, Any]]) -> None:
+        payload = json.dumps(chunks, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with gzip.open(tmp_path, "wb", compresslevel=self.compresslevel) as f:
+                f.write(payload)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            print(f"Warning: Could not write extraction cache entry {key}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        self._evict()
+
+    def _evict(self) -> None:
+        """Delete expired entries, then least recently used ones until the cache fits in max_bytes"""
+        with self._lock:
+            now = time.time()
+            entries = []
+            total = 0
+            for entry in os.scandir(self.cache_dir):
+                if not entry.name.endswith(self.SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                    if self._expired(stat.st_mtime, now):
+                        os.remove(entry.path)
+                        continue
+                except FileNotFoundError:
+                    continue
+                entries.append((max(stat.st_atime, stat.st_mtime), stat.st_size, entry.path))
+                total += stat.st_size
+
+            if total <= self.max_bytes:
+                return
+
+            for _, size, path in sorted(entries):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                if total <= self.max_bytes:
+                    break
+
+    def stats(self) -> Dict[str, Any]:
+        sizes = [
+            entry.stat().st_size
+            for entry in os.scandir(self.cache_dir)
+            if entry.name.endswith(self.SUFFIX)
+        ]
+        return {"entries": len(sizes), "bytes": sum(sizes), "max_bytes": self.max_bytes, "ttl": self.ttl}
+
+
+extraction_cache = (
+    ExtractionCache(Config.EXTRACTION_CACHE_DIR, Config.EXTRACTION_CACHE_MAX_BYTES, Config.EXTRACTION_CACHE_TTL)
+    if Config.EXTRACTION_CACHE_ENABLED
+    else None
+)
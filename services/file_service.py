@@ -1,6 +1,8 @@
 import os
 import re
 import uuid
+import shutil
+import tempfile
 from config import Config
 
 
@@ -63,15 +65,56 @@ class FileService:
 
         return safe_filename
 
+    @classmethod
+    def _unique_upload_path(cls, filename):
+        """Create an empty, uniquely named file in the uploads folder with filename's extension"""
+        os.makedirs(Config.UPLOAD_FOLDER, exist_ok=True)
+        fd, filepath = tempfile.mkstemp(
+            dir=Config.UPLOAD_FOLDER, prefix="upload_", suffix=os.path.splitext(filename)[1]
+        )
+        return fd, filepath
+
     @classmethod
     def save_uploaded_file(cls, file):
+        """
+        Save an upload under a unique name, so concurrent uploads of the same
+        filename can't overwrite each other. Returns (filepath, sanitized filename).
+        """
+        filename = cls.validate_file(file)
+        fd, filepath = cls._unique_upload_path(filename)
+
+        try:
+            with os.fdopen(fd, "wb") as f:
+                file.save(f)
+            return filepath, filename
+        except Exception as e:
+            cls.cleanup_file(filepath)
+            raise IOError(f"Failed to save file: {str(e)}")
+
+    @classmethod
+    def spool_uploaded_file(cls, file):
+        """
+        Read an upload for extraction without a round trip through the uploads folder.
+
+        Uploads up to UPLOAD_SPOOL_MAX_BYTES are returned as bytes; larger ones spill
+        to a uniquely named file in the uploads folder, returned as its path (the
+        caller removes it). Returns (bytes or filepath, sanitized filename).
+        """
         filename = cls.validate_file(file)
-        filepath = os.path.join(Config.UPLOAD_FOLDER, filename)
+        limit = Config.UPLOAD_SPOOL_MAX_BYTES
+        head = file.stream.read(limit + 1)
+
+        if len(head) <= limit:
+            return head, filename
 
+        fd, filepath = cls._unique_upload_path(filename)
         try:
-            file.save(filepath)
+            with os.fdopen(fd, "wb") as f:
+                f.write(head)
+                shutil.copyfileobj(file.stream, f, 1024 * 1024)
             return filepath, filename
         except Exception as e:
+            cls.cleanup_file(filepath)
             raise IOError(f"Failed to save file: {str(e)}")
 
     @classmethod
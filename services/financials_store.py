@@ -0,0 +1,143 @@
+import os
+import time
+import sqlite3
+import threading
+from typing import Optional, Dict, Any, List, Tuple
+
+
+class FinancialsStore:
+    """Compact per-CIK financials reduced from SEC companyfacts, stored in SQLite"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS companies (
+            cik TEXT PRIMARY KEY,
+            entity_name TEXT,
+            ingested_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS latest_financials (
+            cik TEXT NOT NULL,
+            metric TEXT NOT NULL,
+            value REAL NOT NULL,
+            unit TEXT,
+            end_date TEXT,
+            tag TEXT,
+            PRIMARY KEY (cik, metric)
+        );
+        CREATE TABLE IF NOT EXISTS financial_history (
+            cik TEXT NOT NULL,
+            metric TEXT NOT NULL,
+            frequency TEXT NOT NULL,
+            period TEXT NOT NULL,
+            value REAL NOT NULL,
+            unit TEXT,
+            start_date TEXT,
+            end_date TEXT,
+            fy INTEGER,
+            fp TEXT,
+            form TEXT,
+            filed TEXT,
+            tag TEXT,
+            PRIMARY KEY (cik, metric, frequency, period)
+        );
+    """
+    # Bumped whenever the record layout changes; older stores are dropped and
+    # re-ingested, since everything in them can be rebuilt from companyfacts
+    SCHEMA_VERSION = 2
+    TABLES = ("companies", "latest_financials", "financial_series", "financial_history")
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._local = threading.local()
+
+        with self._connection() as conn:
+            if conn.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA_VERSION:
+                for table in self.TABLES:
+                    conn.execute(f"DROP TABLE IF EXISTS {table}")
+                conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+            conn.executescript(self.SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread; sqlite3 connections are not thread-safe"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def put(self, cik: str, record: Dict[str, Any]) -> None:
+        """Replace everything stored for a CIK with a freshly reduced record"""
+        self.put_many([(cik, record)])
+
+    def put_many(self, records: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Replace the stored records for several CIKs in a single transaction"""
+        now = time.time()
+        with self._connection() as conn:
+            for cik, record in records:
+                cik = str(int(cik))
+                conn.execute("DELETE FROM latest_financials WHERE cik = ?", (cik,))
+                conn.execute("DELETE FROM financial_history WHERE cik = ?", (cik,))
+                conn.execute(
+                    "INSERT OR REPLACE INTO companies (cik, entity_name, ingested_at) VALUES (?, ?, ?)",
+                    (cik, record.get("entity_name"), now),
+                )
+                conn.executemany(
+                    "INSERT INTO latest_financials (cik, metric, value, unit, end_date, tag) VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (cik, metric, item["value"], item.get("unit"), item.get("end"), item.get("tag"))
+                        for metric, item in record.get("latest", {}).items()
+                    ],
+                )
+                conn.executemany(
+                    "INSERT INTO financial_history (cik, metric, frequency, period, value, unit, start_date, end_date, "
+                    "fy, fp, form, filed, tag) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            cik, metric, frequency, period, item["value"], item.get("unit"), item.get("start"),
+                            item.get("end"), item.get("fy"), item.get("fp"), item.get("form"), item.get("filed"),
+                            item.get("tag"),
+                        )
+                        for metric, by_frequency in record.get("history", {}).items()
+                        for frequency, by_period in by_frequency.items()
+                        for period, item in by_period.items()
+                    ],
+                )
+
+    def get(self, cik: str) -> Optional[Dict[str, Any]]:
+        """Return the stored record for a CIK, or None if it was never ingested"""
+        cik = str(int(cik))
+        conn = self._connection()
+
+        company = conn.execute(
+            "SELECT entity_name, ingested_at FROM companies WHERE cik = ?", (cik,)
+        ).fetchone()
+        if company is None:
+            return None
+
+        latest = {}
+        for metric, value, unit, end_date, tag in conn.execute(
+            "SELECT metric, value, unit, end_date, tag FROM latest_financials WHERE cik = ?", (cik,)
+        ):
+            latest[metric] = {"value": value, "unit": unit, "end": end_date, "tag": tag}
+
+        history = {}
+        for metric, frequency, period, value, unit, start_date, end_date, fy, fp, form, filed, tag in conn.execute(
+            "SELECT metric, frequency, period, value, unit, start_date, end_date, fy, fp, form, filed, tag "
+            "FROM financial_history WHERE cik = ? ORDER BY metric, frequency, period",
+            (cik,),
+        ):
+            by_frequency = history.setdefault(metric, {"annual": {}, "quarterly": {}})
+            by_frequency.setdefault(frequency, {})[period] = {
+                "value": value, "unit": unit, "start": start_date, "end": end_date,
+                "fy": fy, "fp": fp, "form": form, "filed": filed, "tag": tag,
+            }
+
+        return {
+            "cik": cik,
+            "entity_name": company[0],
+            "ingested_at": company[1],
+            "latest": latest,
+            "history": history,
+        }
@@ -1,5 +1,7 @@
 import google.generativeai as genai
 import json
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from config import Config
 from .pdf_generator import PDFGenerator
@@ -8,6 +10,15 @@ from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
 
 
+# "--- FILE: name ---" style separators written by the upload routes
+FILE_HEADER_PATTERN = re.compile(r"^--- (?:[A-Z]+ )*FILE: .+ ---$")
+# Sheet headers and omitted-section markers: preferred places to cut inside a file
+SECTION_BREAK_PATTERN = re.compile(r"^(?:--- SHEET: .+ ---|\[\.\.\. \d+ non-financial section\(s\) omitted \.\.\.\])$")
+YEAR_PATTERN = re.compile(r"^\d{4}$")
+# What the model writes when a chunk doesn't contain a field; never kept over a real value
+PLACEHOLDER_VALUES = {"", "n/a", "na", "none", "null", "nil", "-", "--", "—", "not available", "not found", "unknown"}
+
+
 class GeminiFinancialExtractor:
     def __init__(self):
         if not Config.GEMINI_API_KEY:
@@ -108,6 +119,12 @@ OUTPUT_SCHEMA (return exactly this JSON structure):
 IMPORTANT: Return ONLY the JSON structure above. No explanations or markdown outside the JSON."""
 
     def extract_financial_data(self, document_text):
+        if Config.FINANCIAL_CHUNKED_MIN_CHARS and len(document_text) > Config.FINANCIAL_CHUNKED_MIN_CHARS:
+            chunked_result = self._extract_financial_data_chunked(document_text)
+            if chunked_result:
+                return chunked_result
+            print("DEBUG: Chunked extraction failed, falling back to a single extraction call")
+
         if self.langchain_extraction_llm:
             try:
                 print("DEBUG: Using LangChain for financial data extraction")
@@ -266,6 +283,175 @@ IMPORTANT: Return ONLY the JSON structure above. No explanations or markdown out
                     return error_info
                 continue
 
+    def _extract_financial_data_chunked(self, document_text):
+        """
+        Map-reduce extraction for long documents: split at file and section
+        boundaries, extract every chunk concurrently with the regular prompt and
+        merge the results in document order. Returns None if every chunk failed.
+        """
+        chunks = self._split_document(document_text, Config.FINANCIAL_CHUNK_CHARS)
+        print(f"DEBUG: Chunked extraction of {len(document_text)} characters in {len(chunks)} chunks")
+
+        with ThreadPoolExecutor(max_workers=max(1, min(Config.FINANCIAL_CHUNK_WORKERS, len(chunks)))) as executor:
+            results = list(executor.map(self._extract_chunk, chunks))
+
+        extracted = [data for data, error in results if data is not None]
+        failed = [
+            {"chunk": index + 1, "error": error}
+            for index, (data, error) in enumerate(results)
+            if data is None
+        ]
+        for failure in failed:
+            print(f"DEBUG: Chunk {failure['chunk']}/{len(chunks)} failed: {failure['error']}")
+
+        if not extracted:
+            return None
+
+        conflicts = []
+        financial_data = self._merge_extractions(extracted, conflicts)
+        if "financial_analysis" in financial_data:
+            financial_data["financial_analysis"] = self._sort_years(financial_data["financial_analysis"])
+        if conflicts:
+            print(f"DEBUG: {len(conflicts)} conflicting values across chunks, kept the earliest")
+
+        pdf_result = self._generate_pdf_if_needed(financial_data)
+
+        return {
+            "success": True,
+            "data": financial_data,
+            "pdf_result": pdf_result,
+            "used_langchain": self.langchain_extraction_llm is not None,
+            "chunk_count": len(chunks),
+            "failed_chunks": failed,
+            "conflicts": conflicts,
+        }
+
+    def _split_document(self, document_text, chunk_chars):
+        """
+        Cut a combined document into chunks of about chunk_chars. Files are never
+        mixed mid-file: a long file is split into parts (preferably at a sheet
+        header or omitted-section marker), each repeating the file's header, and
+        consecutive short files are packed together.
+        """
+        files = []
+        for line in document_text.split("\n"):
+            if FILE_HEADER_PATTERN.match(line.strip()):
+                files.append((line.strip(), []))
+                continue
+            if not files:
+                files.append(("", []))
+            files[-1][1].append(line)
+
+        pieces = []
+        for header, lines in files:
+            current = []
+            size = 0
+            for line in lines:
+                at_break = SECTION_BREAK_PATTERN.match(line.strip()) is not None
+                if current and (size + len(line) > chunk_chars or (at_break and size >= chunk_chars // 2)):
+                    pieces.append((header, "\n".join(current).strip()))
+                    current = []
+                    size = 0
+                current.append(line)
+                size += len(line) + 1
+            if current:
+                pieces.append((header, "\n".join(current).strip()))
+
+        chunks = []
+        for header, body in pieces:
+            if not body:
+                continue
+            piece = f"{header}\n\n{body}" if header else body
+            if chunks and len(chunks[-1]) + len(piece) + 2 <= chunk_chars:
+                chunks[-1] += f"\n\n{piece}"
+            else:
+                chunks.append(piece)
+        return chunks
+
+    def _extract_chunk(self, chunk_text):
+        """Extract one chunk with the financial prompt; returns (data, None) or (None, error)"""
+        full_prompt = self.financial_prompt + chunk_text
+        try:
+            if self.langchain_extraction_llm:
+                response_text = self.langchain_extraction_llm.invoke(full_prompt)
+            else:
+                response_text = self._extract_response_text(
+                    self.model.generate_content(full_prompt, generation_config=self.generation_config)
+                )
+
+            if not response_text or len(response_text.strip()) < 10:
+                raise ValueError("Empty or too short response")
+
+            return self._parse_response(response_text), None
+        except Exception as e:
+            return None, str(e)
+
+    def _merge_extractions(self, extractions, conflicts, path=()):
+        """
+        Deterministically merge per-chunk results in document order: objects merge
+        key by key and lists are concatenated without duplicates. Placeholders
+        (None, "", "N/A", ...) and zeros only survive when no chunk has a real
+        value. Otherwise the first real value wins, keeping the schema's shape, and
+        differing later values are recorded in conflicts.
+        """
+        values = [value for value in extractions if value is not None]
+        if not values:
+            return None
+
+        real = [value for value in values if not self._is_placeholder(value)]
+        if not real:
+            return values[0]
+        values = [value for value in real if not self._is_zero(value)] or real
+
+        if all(isinstance(value, dict) for value in values):
+            keys = []
+            for value in values:
+                keys.extend(key for key in value if key not in keys)
+            return {
+                key: self._merge_extractions([value.get(key) for value in values], conflicts, path + (key,))
+                for key in keys
+            }
+
+        if all(isinstance(value, list) for value in values):
+            merged = []
+            seen = set()
+            for value in values:
+                for item in value:
+                    marker = json.dumps(item, sort_keys=True, ensure_ascii=False, default=str)
+                    if marker not in seen:
+                        seen.add(marker)
+                        merged.append(item)
+            return merged
+
+        distinct = []
+        for value in values:
+            if value not in distinct:
+                distinct.append(value)
+
+        for value in distinct[1:]:
+            conflicts.append({"field": ".".join(map(str, path)), "kept": distinct[0], "ignored": value})
+        return distinct[0]
+
+    @staticmethod
+    def _is_placeholder(value):
+        return value is None or (isinstance(value, str) and value.strip().lower() in PLACEHOLDER_VALUES)
+
+    @staticmethod
+    def _is_zero(value):
+        if isinstance(value, bool):
+            return False
+        if isinstance(value, (int, float)):
+            return value == 0
+        return isinstance(value, str) and value.strip() in ("0", "0.0", "0.00")
+
+    def _sort_years(self, data):
+        """Order year keys chronologically, ahead of any other keys (such as notes)"""
+        if not isinstance(data, dict):
+            return data
+        years = sorted(key for key in data if YEAR_PATTERN.match(str(key)))
+        others = [key for key in data if not YEAR_PATTERN.match(str(key))]
+        return {key: self._sort_years(data[key]) for key in years + others}
+
     def analyze_investment_data(self, document_text):
         if self.langchain_extraction_llm:
             try:
@@ -0,0 +1,286 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from flask import current_app, request
+from config import Config
+from .response_formatter import ResponseFormatter
+from .error_handler import ErrorHandler
+
+
+JOB_FIELDS = (
+    "id", "kind", "status", "owner_pid", "created_at", "started_at",
+    "finished_at", "status_code", "result", "error",
+)
+
+
+class JobQueueFullError(Exception):
+    pass
+
+
+class InMemoryJobStore:
+    """Job records in a dict; status is only visible to the process that ran the job"""
+
+    def __init__(self):
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def create(self, job: Dict[str, Any]) -> None:
+        with self._lock:
+            self._jobs[job["id"]] = {field: job.get(field) for field in JOB_FIELDS}
+
+    def update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def purge(self, finished_before: float) -> None:
+        with self._lock:
+            for job_id in [
+                job_id for job_id, job in self._jobs.items()
+                if job["finished_at"] and job["finished_at"] < finished_before
+            ]:
+                del self._jobs[job_id]
+
+
+class SQLiteJobStore:
+    """
+    Job records in SQLite, so any server process can report on a job. Jobs run in
+    the process that accepted them; unfinished jobs whose process is gone are
+    marked failed when a store is opened.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            status TEXT NOT NULL,
+            owner_pid INTEGER NOT NULL,
+            created_at REAL NOT NULL,
+            started_at REAL,
+            finished_at REAL,
+            status_code INTEGER,
+            result TEXT,
+            error TEXT
+        );
+        CREATE INDEX IF NOT EXISTS jobs_finished_at ON jobs (finished_at);
+    """
+    FIELDS = JOB_FIELDS
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._local = threading.local()
+
+        with self._connection() as conn:
+            conn.executescript(self.SCHEMA)
+            self._fail_orphaned_jobs(conn)
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread; sqlite3 connections are not thread-safe"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _pid_alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def _fail_orphaned_jobs(self, conn: sqlite3.Connection) -> None:
+        owners = [
+            row[0] for row in conn.execute(
+                "SELECT DISTINCT owner_pid FROM jobs WHERE status IN ('queued', 'running')"
+            )
+        ]
+        for pid in owners:
+            if pid == os.getpid() or not self._pid_alive(pid):
+                conn.execute(
+                    "UPDATE jobs SET status = 'failed', finished_at = ?, error = ? "
+                    "WHERE owner_pid = ? AND status IN ('queued', 'running')",
+                    (time.time(), "Job was interrupted by a server restart", pid),
+                )
+
+    def create(self, job: Dict[str, Any]) -> None:
+        with self._connection() as conn:
+            conn.execute(
+                f"INSERT INTO jobs ({', '.join(self.FIELDS)}) VALUES ({', '.join('?' for _ in self.FIELDS)})",
+                [self._encode(field, job.get(field)) for field in self.FIELDS],
+            )
+
+    def update(self, job_id: str, **fields) -> None:
+        with self._connection() as conn:
+            conn.execute(
+                f"UPDATE jobs SET {', '.join(f'{field} = ?' for field in fields)} WHERE id = ?",
+                [self._encode(field, value) for field, value in fields.items()] + [job_id],
+            )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute(
+            f"SELECT {', '.join(self.FIELDS)} FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        job = dict(zip(self.FIELDS, row))
+        if job["result"] is not None:
+            job["result"] = json.loads(job["result"])
+        return job
+
+    def purge(self, finished_before: float) -> None:
+        with self._connection() as conn:
+            conn.execute("DELETE FROM jobs WHERE finished_at < ?", (finished_before,))
+
+    @staticmethod
+    def _encode(field: str, value: Any) -> Any:
+        if field == "result" and value is not None:
+            return json.dumps(value, ensure_ascii=False, default=str)
+        return value
+
+
+class JobQueue:
+    """
+    Runs long analyses on a bounded thread pool so request threads return at once.
+
+    At most max_pending jobs may be queued or running; further submissions raise
+    JobQueueFullError. Finished jobs are kept for result_ttl seconds.
+    """
+
+    def __init__(self, store, workers: int, max_pending: int, result_ttl: float):
+        self.store = store
+        self.workers = workers
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, func: Callable[..., Dict[str, Any]], *args, **kwargs) -> Dict[str, Any]:
+        """
+        Queue func(*args, **kwargs), which returns {"status_code": int, "body": ...}.
+        Returns the new job record.
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise JobQueueFullError(f"Job queue is full ({self.max_pending} jobs pending), try again later")
+            self._pending += 1
+
+        try:
+            self.store.purge(time.time() - self.result_ttl)
+            job = {
+                "id": uuid.uuid4().hex,
+                "kind": kind,
+                "status": "queued",
+                "owner_pid": os.getpid(),
+                "created_at": time.time(),
+            }
+            self.store.create(job)
+            self._executor.submit(self._run, job["id"], func, args, kwargs)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+
+        return self.store.get(job["id"])
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.store.get(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = self._pending
+        return {"pending": pending, "max_pending": self.max_pending, "workers": self.workers}
+
+    def _run(self, job_id: str, func: Callable[..., Dict[str, Any]], args: tuple, kwargs: dict) -> None:
+        try:
+            self.store.update(job_id, status="running", started_at=time.time())
+            outcome = func(*args, **kwargs)
+            status_code = outcome["status_code"]
+            body = outcome["body"]
+            failed = status_code >= 400 or (isinstance(body, dict) and body.get("success") is False)
+            error = body.get("error") if failed and isinstance(body, dict) else None
+            self.store.update(
+                job_id,
+                status="failed" if failed else "succeeded",
+                finished_at=time.time(),
+                status_code=status_code,
+                result=body,
+                error=error,
+            )
+        except Exception as e:
+            print(f"Warning: Job {job_id} failed: {e}")
+            self.store.update(job_id, status="failed", finished_at=time.time(), error=str(e))
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+
+def _create_job_store():
+    if Config.JOB_BACKEND == "memory":
+        return InMemoryJobStore()
+    if Config.JOB_BACKEND != "sqlite":
+        print(f"Warning: Unknown JOB_BACKEND '{Config.JOB_BACKEND}', using sqlite")
+    return SQLiteJobStore(Config.JOB_DB_PATH)
+
+
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """The process's job queue, created on first use so importing the routes opens no job store"""
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = JobQueue(
+                _create_job_store(), Config.JOB_WORKERS, Config.JOB_MAX_PENDING, Config.JOB_RESULT_TTL
+            )
+        return _job_queue
+
+
+def _run_in_app_context(app, work: Callable[[], Any]) -> Dict[str, Any]:
+    """Job body for a route: run its response-producing work and keep the JSON it would have returned"""
+    with app.app_context():
+        response = work()
+        response, status_code = response if isinstance(response, tuple) else (response, response.status_code)
+        return {"status_code": status_code, "body": response.get_json()}
+
+
+def wants_async() -> bool:
+    return request.args.get("async", "").lower() in ("1", "true", "yes")
+
+
+def run_or_submit(kind: str, work: Callable[[], Any]):
+    """
+    Return work()'s response directly, or with ?async=true queue it and answer
+    202 with the job id; /jobs/<id> later returns the same response body.
+
+    work must not touch the request, which is gone by the time a job runs.
+    """
+    if not wants_async():
+        return work()
+
+    try:
+        job = get_job_queue().submit(kind, _run_in_app_context, current_app._get_current_object(), work)
+    except JobQueueFullError as e:
+        return ErrorHandler.api_error(str(e))
+
+    return ResponseFormatter.format_job_submitted(job)
@@ -0,0 +1,176 @@
+import io
+import inspect
+import importlib.util
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Sequence, Type, Union
+
+
+class PDFBackend(ABC):
+    """
+    Page-level text extraction over one PDF library.
+
+    Backends import their library lazily, so the registry can list every known
+    backend and only the configured one has to be installed. Documents are
+    opened from a file path or from the file's bytes.
+    """
+
+    name = ""
+    module = ""
+
+    @abstractmethod
+    def open(self, source: Union[str, bytes]) -> Any:
+        ...
+
+    @abstractmethod
+    def pages(self, document: Any) -> Sequence[Any]:
+        """Indexable sequence of page handles, in page order"""
+
+    @abstractmethod
+    def page_text(self, page: Any) -> str:
+        ...
+
+    def close(self, document: Any) -> None:
+        pass
+
+
+class PyPDF2Backend(PDFBackend):
+    name = "pypdf2"
+    module = "PyPDF2"
+
+    def _reader_class(self):
+        from PyPDF2 import PdfReader
+        return PdfReader
+
+    def open(self, source: Union[str, bytes]) -> Any:
+        reader = self._reader_class()(io.BytesIO(source) if isinstance(source, bytes) else source)
+
+        if reader.is_encrypted:
+            try:
+                reader.decrypt("")
+            except Exception:
+                raise ValueError("PDF is password-protected and cannot be read without the password")
+
+        return reader
+
+    def pages(self, document: Any) -> Sequence[Any]:
+        return document.pages
+
+    def page_text(self, page: Any) -> str:
+        return page.extract_text()
+
+
+class PypdfBackend(PyPDF2Backend):
+    """pypdf is the maintained successor of PyPDF2 and shares its reader API"""
+
+    name = "pypdf"
+    module = "pypdf"
+
+    def _reader_class(self):
+        from pypdf import PdfReader
+        return PdfReader
+
+
+class PdfminerBackend(PDFBackend):
+    name = "pdfminer"
+    module = "pdfminer"
+
+    def open(self, source: Union[str, bytes]) -> Any:
+        from pdfminer.pdfdocument import PDFDocument, PDFPasswordIncorrect
+        from pdfminer.pdfpage import PDFPage
+        from pdfminer.pdfparser import PDFParser
+
+        f = io.BytesIO(source) if isinstance(source, bytes) else open(source, "rb")
+        try:
+            document = PDFDocument(PDFParser(f), password="")
+            return {"file": f, "pages": list(PDFPage.create_pages(document))}
+        except PDFPasswordIncorrect:
+            f.close()
+            raise ValueError("PDF is password-protected and cannot be read without the password")
+        except Exception:
+            f.close()
+            raise
+
+    def pages(self, document: Any) -> Sequence[Any]:
+        return document["pages"]
+
+    def page_text(self, page: Any) -> str:
+        from pdfminer.converter import TextConverter
+        from pdfminer.layout import LAParams
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+
+        output = io.StringIO()
+        resources = PDFResourceManager()
+        device = TextConverter(resources, output, laparams=LAParams())
+        try:
+            PDFPageInterpreter(resources, device).process_page(page)
+        finally:
+            device.close()
+        return output.getvalue()
+
+    def close(self, document: Any) -> None:
+        document["file"].close()
+
+
+class Pypdfium2Backend(PDFBackend):
+    """
+    Google's PDFium via pypdfium2. Much the fastest, but extraction runs in C,
+    so the SIGALRM page timeout only takes effect once the page returns.
+    """
+
+    name = "pypdfium2"
+    module = "pypdfium2"
+
+    def open(self, source: Union[str, bytes]) -> Any:
+        import pypdfium2 as pdfium
+
+        try:
+            return pdfium.PdfDocument(source)
+        except pdfium.PdfiumError as e:
+            if "password" in str(e).lower():
+                raise ValueError("PDF is password-protected and cannot be read without the password")
+            raise
+
+    def pages(self, document: Any) -> Sequence[Any]:
+        return document
+
+    def page_text(self, page: Any) -> str:
+        textpage = page.get_textpage()
+        try:
+            return textpage.get_text_range()
+        finally:
+            textpage.close()
+
+    def close(self, document: Any) -> None:
+        document.close()
+
+
+def _register(*backends: Type[PDFBackend]) -> Dict[str, Type[PDFBackend]]:
+    """Registry by name; rejects backends that leave an abstract method unimplemented"""
+    for backend in backends:
+        if inspect.isabstract(backend):
+            missing = ", ".join(sorted(backend.__abstractmethods__))
+            raise TypeError(f"PDF backend {backend.__name__} does not implement: {missing}")
+    return {backend.name: backend for backend in backends}
+
+
+PDF_BACKENDS = _register(PyPDF2Backend, PypdfBackend, PdfminerBackend, Pypdfium2Backend)
+DEFAULT_PDF_BACKEND = PyPDF2Backend.name
+
+
+def available_backends() -> List[str]:
+    """Names of the registered backends whose library is installed"""
+    return [name for name, backend in PDF_BACKENDS.items() if importlib.util.find_spec(backend.module)]
+
+
+def get_pdf_backend(name: Optional[str] = None) -> PDFBackend:
+    """Backend by name, falling back to PyPDF2 when it is unknown or not installed"""
+    name = (name or DEFAULT_PDF_BACKEND).lower()
+
+    if name not in PDF_BACKENDS:
+        print(f"Warning: Unknown PDF backend '{name}', using {DEFAULT_PDF_BACKEND}")
+        name = DEFAULT_PDF_BACKEND
+    elif name not in available_backends():
+        print(f"Warning: PDF backend '{name}' is not installed, using {DEFAULT_PDF_BACKEND}")
+        name = DEFAULT_PDF_BACKEND
+
+    return PDF_BACKENDS[name]()
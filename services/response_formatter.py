@@ -21,6 +21,7 @@ class ResponseFormatter:
         pdf_result=None,
         file_count=1,
         processed_files=None,
+        file_timings=None,
     ):
         response_data = {
             "message": "success",
@@ -32,6 +33,9 @@ class ResponseFormatter:
         if processed_files:
             response_data["processed_files"] = processed_files
 
+        if file_timings:
+            response_data["file_timings"] = file_timings
+
         if financial_analysis and financial_analysis.get("success"):
             response_data["success"] = True
             full_data = financial_analysis.get("data", financial_analysis)
@@ -55,7 +59,7 @@ class ResponseFormatter:
 
     @staticmethod
     def format_investment_response(
-        filename, text_length, investment_analysis, file_count=1, processed_files=None
+        filename, text_length, investment_analysis, file_count=1, processed_files=None, file_timings=None
     ):
         response_data = {
             "message": "success",
@@ -67,6 +71,9 @@ class ResponseFormatter:
         if processed_files:
             response_data["processed_files"] = processed_files
 
+        if file_timings:
+            response_data["file_timings"] = file_timings
+
         if investment_analysis and investment_analysis.get("success"):
             response_data["success"] = True
             response_data["data"] = {
@@ -161,7 +168,7 @@ class ResponseFormatter:
         return jsonify(response_data), 200
 
     @staticmethod
-    def format_competitor_response(competitor_result):
+    def format_competitor_response(competitor_result, file_timings=None):
         if competitor_result.get("success"):
             response_data = {
                 "success": True,
@@ -175,10 +182,13 @@ class ResponseFormatter:
                 "error": competitor_result.get("error", "Unknown error occurred"),
             }
 
+        if file_timings:
+            response_data["file_timings"] = file_timings
+
         return jsonify(response_data), 200
 
     @staticmethod
-    def format_comparison_response(comparison_result):
+    def format_comparison_response(comparison_result, file_timings=None):
         if comparison_result.get("success"):
             response_data = {
                 "success": True,
@@ -192,6 +202,38 @@ class ResponseFormatter:
                 "error": comparison_result.get("error", "Unknown error occurred"),
             }
 
+        if file_timings:
+            response_data["file_timings"] = file_timings
+
+        return jsonify(response_data), 200
+
+    @staticmethod
+    def format_job_submitted(job):
+        return jsonify({
+            "success": True,
+            "message": "Job queued",
+            "job_id": job["id"],
+            "status": job["status"],
+            "status_url": f"/jobs/{job['id']}",
+        }), 202
+
+    @staticmethod
+    def format_job_response(job):
+        response_data = {
+            "success": True,
+            "job_id": job["id"],
+            "kind": job["kind"],
+            "status": job["status"],
+            "created_at": job["created_at"],
+            "started_at": job["started_at"],
+            "finished_at": job["finished_at"],
+        }
+
+        if job["status"] in ("succeeded", "failed"):
+            response_data["result"] = job["result"]
+            response_data["result_status_code"] = job["status_code"]
+            response_data["error"] = job["error"]
+
         return jsonify(response_data), 200
 
     @staticmethod
@@ -0,0 +1,79 @@
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Optional, Dict, Any, List, Tuple, Callable
+from .sec_client import sec_client
+from .xbrl_concepts import stream_tracked_facts
+from .xbrl_history import reduce_company_facts
+
+COMPANYFACTS_ARCHIVE_URL = "https://www.sec.gov/Archives/edgar/daily-index/xbrl/companyfacts.zip"
+
+_MEMBER_PATTERN = re.compile(r"^CIK(\d{10})\.json$")
+
+
+def download_archive(dest_path: str, url: str = COMPANYFACTS_ARCHIVE_URL) -> str:
+    """Stream SEC's nightly companyfacts.zip to disk without buffering it in memory"""
+    os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+    tmp_path = f"{dest_path}.{os.getpid()}.tmp"
+
+    r = sec_client.get(url, stream=True, timeout=120)
+    try:
+        r.raise_for_status()
+        with open(tmp_path, "wb") as f:
+            for chunk in r.iter_content(chunk_size=1024 * 1024):
+                f.write(chunk)
+    finally:
+        r.close()
+
+    os.replace(tmp_path, dest_path)
+    return dest_path
+
+
+def _reduce_members(archive_path: str, member_names: List[str]) -> List[Tuple[str, Dict[str, Any]]]:
+    """Worker: stream each archive member and reduce it to a compact financials record"""
+    records = []
+    with zipfile.ZipFile(archive_path) as archive:
+        for name in member_names:
+            cik = str(int(_MEMBER_PATTERN.match(name).group(1)))
+            try:
+                with archive.open(name) as member:
+                    facts = stream_tracked_facts(member)
+                records.append((cik, reduce_company_facts(facts)))
+            except Exception as e:
+                print(f"Warning: Skipping {name} from {os.path.basename(archive_path)}: {e}")
+
+    return records
+
+
+def bulk_ingest(
+    archive_path: str,
+    store,
+    workers: Optional[int] = None,
+    batch_size: int = 250,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, int]:
+    """
+    Populate the financials store from a companyfacts.zip archive.
+
+    Members are parsed and reduced in parallel worker processes; the parent
+    process is the only SQLite writer and commits one transaction per batch.
+    """
+    with zipfile.ZipFile(archive_path) as archive:
+        members = [name for name in archive.namelist() if _MEMBER_PATTERN.match(name)]
+
+    batches = [members[i:i + batch_size] for i in range(0, len(members), batch_size)]
+    ingested = 0
+    done = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_reduce_members, archive_path, batch) for batch in batches]
+        for future in as_completed(futures):
+            records = future.result()
+            store.put_many(records)
+            ingested += len(records)
+            done += 1
+            if progress:
+                progress(done, len(batches))
+
+    return {"members": len(members), "ingested": ingested, "skipped": len(members) - ingested}
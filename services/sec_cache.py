@@ -0,0 +1,222 @@
+import os
+import gzip
+import json
+import time
+import threading
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, List
+
+try:
+    import fcntl
+except ImportError:  # Windows: the manifest lock only covers threads of one process
+    fcntl = None
+
+
+class SECCache:
+    """
+    File-backed cache for SEC API payloads with per-entry TTL and HTTP validators.
+
+    Payloads are stored as compact gzip-compressed JSON (``<name>.gz``) and all
+    entry metadata lives in a single ``manifest.json``. Pretty-printed ``<name>``
+    files written by older versions are still readable until migrated.
+    """
+
+    MANIFEST_NAME = "manifest.json"
+    MANIFEST_LOCK_NAME = "manifest.lock"
+    FORMAT = "json+gzip"
+
+    def __init__(self, cache_dir: str, default_ttl: int, stale_ttl: int, compresslevel: int = 6):
+        self.cache_dir = cache_dir
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.compresslevel = compresslevel
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.cache_dir, name)
+
+    def _blob_path(self, name: str) -> str:
+        return self.path(f"{name}.gz")
+
+    def _legacy_meta_path(self, name: str) -> str:
+        base, _ = os.path.splitext(name)
+        return self.path(f"{base}.meta.json")
+
+    def _read_manifest(self) -> Dict[str, Dict[str, Any]]:
+        manifest_path = self.path(self.MANIFEST_NAME)
+        if not os.path.exists(manifest_path):
+            return {}
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable SEC cache manifest: {e}")
+            return {}
+
+    def _write_manifest(self, manifest: Dict[str, Dict[str, Any]]) -> None:
+        tmp_path = self.path(f"{self.MANIFEST_NAME}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path(self.MANIFEST_NAME))
+
+    @contextmanager
+    def _manifest_lock(self):
+        """Serialise manifest updates across threads and, via flock, across server processes"""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+
+            with open(self.path(self.MANIFEST_LOCK_NAME), "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _update_manifest(self, name: str, meta: Dict[str, Any]) -> None:
+        """Re-read, modify and atomically replace the manifest under the cross-process lock"""
+        with self._manifest_lock():
+            manifest = self._read_manifest()
+            manifest[name] = meta
+            self._write_manifest(manifest)
+
+    def _write_blob(self, name: str, data: Any) -> int:
+        payload = json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        tmp_path = f"{self._blob_path(name)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, "wb", compresslevel=self.compresslevel) as f:
+            f.write(payload)
+        os.replace(tmp_path, self._blob_path(name))
+        return os.path.getsize(self._blob_path(name))
+
+    def exists(self, name: str) -> bool:
+        return os.path.exists(self._blob_path(name)) or os.path.exists(self.path(name))
+
+    def names(self) -> List[str]:
+        """Logical names of every entry, migrated or not"""
+        names = set(self._read_manifest())
+        for filename in os.listdir(self.cache_dir):
+            if filename.endswith(".json") and filename != self.MANIFEST_NAME and not filename.endswith(".meta.json"):
+                names.add(filename)
+        return sorted(n for n in names if self.exists(n))
+
+    def load(self, name: str) -> Optional[Dict[str, Any]]:
+        """Load a cached payload, or None if it is missing or unreadable"""
+        try:
+            if os.path.exists(self._blob_path(name)):
+                with gzip.open(self._blob_path(name), "rb") as f:
+                    return json.loads(f.read())
+
+            if os.path.exists(self.path(name)):
+                with open(self.path(name), "r", encoding="utf-8") as f:
+                    return json.load(f)
+        except (OSError, ValueError, EOFError) as e:
+            print(f"Warning: Ignoring unreadable SEC cache entry {name}: {e}")
+
+        return None
+
+    def load_meta(self, name: str) -> Dict[str, Any]:
+        """Load validators and timestamps for an entry.
+
+        Unmigrated entries fall back to their legacy sidecar file or the file mtime."""
+        meta = dict(self._read_manifest().get(name, {}))
+
+        if not meta and os.path.exists(self._legacy_meta_path(name)):
+            try:
+                with open(self._legacy_meta_path(name), "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                meta = {}
+
+        if "fetched_at" not in meta:
+            for path in (self._blob_path(name), self.path(name)):
+                if os.path.exists(path):
+                    meta["fetched_at"] = os.path.getmtime(path)
+                    break
+
+        meta.setdefault("ttl", self.default_ttl)
+        return meta
+
+    def save(
+        self,
+        name: str,
+        data: Dict[str, Any],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        ttl: Optional[int] = None,
+        fetched_at: Optional[float] = None,
+    ) -> None:
+        """Atomically write a payload and record its HTTP validators in the manifest"""
+        size = self._write_blob(name, data)
+
+        self._update_manifest(name, {
+            "file": os.path.basename(self._blob_path(name)),
+            "format": self.FORMAT,
+            "size": size,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": fetched_at if fetched_at is not None else time.time(),
+            "ttl": ttl if ttl is not None else self.default_ttl,
+        })
+
+        self._remove_legacy(name)
+
+    def touch(self, name: str) -> None:
+        """Mark an entry as freshly revalidated (HTTP 304)"""
+        meta = self.load_meta(name)
+        meta["fetched_at"] = time.time()
+
+        if name in self._read_manifest():
+            self._update_manifest(name, meta)
+        else:
+            with open(self._legacy_meta_path(name), "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+
+    def freshness(self, name: str) -> str:
+        """Classify an entry as 'missing', 'fresh', 'stale' (servable while revalidating) or 'expired'"""
+        if not self.exists(name):
+            return "missing"
+
+        meta = self.load_meta(name)
+        age = time.time() - meta["fetched_at"]
+        if age < meta["ttl"]:
+            return "fresh"
+        if age < meta["ttl"] + self.stale_ttl:
+            return "stale"
+        return "expired"
+
+    def _remove_legacy(self, name: str) -> None:
+        for path in (self.path(name), self._legacy_meta_path(name)):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def migrate(self) -> Dict[str, int]:
+        """Rewrite legacy pretty-printed entries in the compressed format, keeping their validators"""
+        manifest = self._read_manifest()
+        migrated = 0
+        bytes_before = 0
+        bytes_after = 0
+
+        for name in self.names():
+            if name in manifest or not os.path.exists(self.path(name)):
+                continue
+
+            data = self.load(name)
+            if data is None:
+                continue
+
+            meta = self.load_meta(name)
+            bytes_before += os.path.getsize(self.path(name))
+            self.save(
+                name,
+                data,
+                etag=meta.get("etag"),
+                last_modified=meta.get("last_modified"),
+                ttl=meta.get("ttl"),
+                fetched_at=meta.get("fetched_at"),
+            )
+            bytes_after += os.path.getsize(self._blob_path(name))
+            migrated += 1
+
+        return {"migrated": migrated, "bytes_before": bytes_before, "bytes_after": bytes_after}
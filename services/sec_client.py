@@ -0,0 +1,137 @@
+import time
+import random
+import threading
+import requests
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
+from typing import Optional, Dict
+from config import Config
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket; acquire() blocks until a token is available.
+
+    The default capacity of one token allows no burst, so requests in any one-second
+    window never exceed `rate` (a full bucket of `rate` tokens would allow almost 2x).
+    """
+
+    def __init__(self, rate: float, capacity: float = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            # Sleep outside the lock so other threads can keep refilling/acquiring
+            time.sleep(wait)
+
+
+class SECClient:
+    """
+    Shared HTTP client for SEC.gov: one keep-alive connection pool, a
+    process-wide token bucket honoring SEC's fair-access limit, and retries
+    with jittered exponential backoff on connection errors, 429 and 5xx.
+
+    A Retry-After header is honoured as given; backoff_max only caps the computed
+    backoff. Waits longer than retry_after_max are not retried at all, so a long
+    server-requested pause returns the error instead of retrying early.
+    """
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(
+        self,
+        user_agent: str = "NGL Financial Analysis (contact@ngl.com)",
+        requests_per_second: float = 10,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        retry_after_max: float = 120.0,
+        pool_size: int = 10,
+    ):
+        self.user_agent = user_agent
+        self.limiter = TokenBucket(requests_per_second)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_after_max = retry_after_max
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @staticmethod
+    def _retry_after(value: Optional[str]) -> Optional[float]:
+        """Seconds a Retry-After header asks for (delay-seconds or HTTP-date), or None"""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter keeps concurrent retries from re-synchronizing
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def get(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        stream: bool = False,
+        timeout: float = 30,
+    ) -> requests.Response:
+        """GET with rate limiting and retries; the final response is returned unchecked"""
+        request_headers = {"User-Agent": self.user_agent}
+        if headers:
+            request_headers.update(headers)
+
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            try:
+                r = self.session.get(url, headers=request_headers, timeout=timeout, stream=stream)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self._backoff(attempt))
+                continue
+
+            if r.status_code in self.RETRY_STATUSES and attempt < self.max_retries:
+                retry_after = self._retry_after(r.headers.get("Retry-After"))
+                if retry_after is not None and retry_after > self.retry_after_max:
+                    print(f"Warning: SEC returned {r.status_code} for {url} and asked to wait {retry_after:.0f}s, not retrying")
+                    return r
+
+                delay = retry_after if retry_after is not None else self._backoff(attempt)
+                r.close()
+                print(f"Warning: SEC returned {r.status_code} for {url}, retrying in {delay:.2f}s")
+                time.sleep(delay)
+                continue
+
+            return r
+
+
+sec_client = SECClient(
+    requests_per_second=Config.SEC_REQUESTS_PER_SECOND,
+    max_retries=Config.SEC_MAX_RETRIES,
+    retry_after_max=Config.SEC_RETRY_AFTER_MAX,
+)
@@ -1,13 +1,25 @@
 import os
-import json
+import copy
 import time
 import re
+import ijson
 import requests
+import urllib3
+import threading
 import warnings
-from rapidfuzz import process, fuzz
+from concurrent.futures import ThreadPoolExecutor
 from bs4 import BeautifulSoup, XMLParsedAsHTMLWarning
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any, Tuple, List
+from typing import Optional, Dict, Any, Tuple, List, Callable, BinaryIO
+from config import Config
+from .sec_cache import SECCache
+from .sec_client import sec_client
+from .financials_store import FinancialsStore
+from .company_index import CompanyIndex
+from .company_matcher import resolve_alias
+from .ttl_cache import TTLCache
+from .xbrl_concepts import stream_tracked_facts
+from .xbrl_history import reduce_company_facts
 
 class SECLookupService:
     """Service for looking up companies via SEC.gov API"""
@@ -15,165 +27,255 @@ class SECLookupService:
     def __init__(self, user_agent: str = "NGL Financial Analysis (contact@ngl.com)"):
         self.user_agent = user_agent
         self.cik_json_url = "https://www.sec.gov/files/company_tickers.json"
-        self.request_delay = 0.25
-        self.cache_dir = "cache/sec"
+        self.client = sec_client
+        self.cache_dir = Config.SEC_CACHE_DIR
         self.filings_dir = "filings"
-        os.makedirs(self.cache_dir, exist_ok=True)
         os.makedirs(self.filings_dir, exist_ok=True)
 
-        self._company_index = None
-        self._name_to_cik = None
-        self._ticker_to_cik = None
-        self._choices = None
+        self.cache = SECCache(self.cache_dir, Config.SEC_FACTS_TTL, Config.SEC_STALE_TTL)
+        self._revalidating = set()
+        self._revalidating_lock = threading.Lock()
 
-    def _fetch_json(self, url: str, save_path: Optional[str] = None) -> Dict[str, Any]:
+        self.financials_store = FinancialsStore(os.path.join(self.cache_dir, "financials.sqlite3"))
+
+        self._index = CompanyIndex(os.path.join(self.cache_dir, "company_index"))
+        self._index_lock = threading.Lock()
+        self._gemini = None
+        self._gemini_lock = threading.Lock()
+
+        self.lookup_cache = TTLCache(Config.SEC_LOOKUP_CACHE_SIZE, Config.SEC_LOOKUP_CACHE_TTL)
+
+    def _fetch_json(
+        self, url: str, extra_headers: Optional[Dict[str, str]] = None, stream: bool = False
+    ) -> requests.Response:
         """Fetch JSON from URL with proper headers"""
         headers = {"User-Agent": self.user_agent, "Accept": "application/json"}
-        r = requests.get(url, headers=headers, timeout=30)
-        r.raise_for_status()
-        data = r.json()
+        if extra_headers:
+            headers.update(extra_headers)
+
+        r = self.client.get(url, headers=headers, timeout=30, stream=stream)
+        if r.status_code != 304:
+            try:
+                r.raise_for_status()
+            except requests.HTTPError:
+                r.close()
+                raise
+
+        return r
+
+    def _revalidate(
+        self,
+        url: str,
+        name: str,
+        ttl: Optional[int] = None,
+        stream_parser: Optional[Callable[[BinaryIO], Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Conditionally refetch a cache entry using its ETag/Last-Modified validators.
 
-        if save_path:
-            with open(save_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+        With a stream_parser the response body is parsed incrementally instead of
+        being buffered and decoded in full.
+        """
+        meta = self.cache.load_meta(name)
+        cached = self.cache.load(name)
 
-        time.sleep(self.request_delay)
-        return data
+        conditional = {}
+        if cached is not None:
+            if meta.get("etag"):
+                conditional["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                conditional["If-Modified-Since"] = meta["last_modified"]
 
-    def _build_company_index(self) -> None:
-        """Build searchable index of companies from SEC data"""
-        cache_path = os.path.join(self.cache_dir, "company_tickers.json")
-
-        if os.path.exists(cache_path):
-            with open(cache_path, "r", encoding="utf-8") as f:
-                raw = json.load(f)
-        else:
-            raw = self._fetch_json(self.cik_json_url, save_path=cache_path)
-
-        records = []
-        for k, v in raw.items():
-            title = v.get("title", "").strip()
-            ticker = v.get("ticker", "").strip()
-            cik = str(v.get("cik_str", "")).strip()
-            records.append({"title": title, "ticker": ticker, "cik": cik})
-
-        self._company_index = records
-        self._name_to_cik = {r["title"].lower(): r["cik"] for r in records}
-        self._ticker_to_cik = {r["ticker"].upper(): r["cik"] for r in records if r["ticker"]}
-        self._choices = [r["title"] for r in records] + [r["ticker"] for r in records if r["ticker"]]
-
-    def _parse_number_from_str(self, s: str) -> Optional[float]:
-        """Parse number from string with various formats"""
-        if s is None:
-            return None
+        r = self._fetch_json(url, extra_headers=conditional, stream=stream_parser is not None)
+        try:
+            if r.status_code == 304 and cached is not None:
+                self.cache.touch(name)
+                return cached
 
-        s = str(s).strip()
-        negative = False
+            if stream_parser is not None:
+                r.raw.decode_content = True
+                try:
+                    data = stream_parser(r.raw)
+                except (urllib3.exceptions.HTTPError, ijson.JSONError, OSError) as e:
+                    # The body broke off after the headers arrived (dropped connection,
+                    # read timeout, truncated JSON); surface it like any other request failure
+                    raise requests.RequestException(f"Failed to read SEC response for {name}: {e}") from e
+            else:
+                data = r.json()
+        finally:
+            r.close()
+
+        self.cache.save(
+            name,
+            data,
+            etag=r.headers.get("ETag"),
+            last_modified=r.headers.get("Last-Modified"),
+            ttl=ttl,
+        )
+        return data
 
-        if s.startswith("(") and s.endswith(")"):
-            negative = True
-            s = s[1:-1]
+    def _revalidate_in_background(
+        self,
+        url: str,
+        name: str,
+        ttl: Optional[int] = None,
+        stream_parser: Optional[Callable[[BinaryIO], Dict[str, Any]]] = None,
+    ) -> None:
+        """Refresh a stale entry off the request thread, at most once per entry at a time"""
+        with self._revalidating_lock:
+            if name in self._revalidating:
+                return
+            self._revalidating.add(name)
+
+        def worker():
+            try:
+                self._revalidate(url, name, ttl, stream_parser)
+            except Exception as e:
+                print(f"Warning: Background SEC revalidation failed for {name}: {e}")
+            finally:
+                with self._revalidating_lock:
+                    self._revalidating.discard(name)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _get_cached_json(
+        self,
+        url: str,
+        name: str,
+        ttl: Optional[int] = None,
+        stream_parser: Optional[Callable[[BinaryIO], Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Read-through cache for SEC JSON documents.
 
-        mul = 1
-        sl = s.lower()
-        if "billion" in sl:
-            mul = 1_000_000_000
-        elif "million" in sl:
-            mul = 1_000_000
-        elif "thousand" in sl:
-            mul = 1_000
+        Fresh entries are served from disk, stale entries are served immediately
+        while being revalidated in the background, and expired entries are
+        revalidated synchronously (falling back to the stale copy if SEC is unreachable).
+        """
+        state = self.cache.freshness(name)
 
-        cleaned = re.sub(r"[^\d\.\-,]", "", s).replace(",", "")
-        if cleaned == "":
-            return None
+        if state == "fresh":
+            cached = self.cache.load(name)
+            if cached is not None:
+                return cached
+
+        if state == "stale":
+            cached = self.cache.load(name)
+            if cached is not None:
+                self._revalidate_in_background(url, name, ttl, stream_parser)
+                return cached
 
         try:
-            val = float(cleaned)
-        except:
-            return None
+            return self._revalidate(url, name, ttl, stream_parser)
+        except requests.RequestException as e:
+            cached = self.cache.load(name)
+            if cached is None:
+                raise
+            print(f"Warning: SEC revalidation failed for {name}, serving cached copy: {e}")
+            return cached
 
-        val *= mul
-        if negative:
-            val = -val
+    def _build_company_index(self) -> None:
+        """
+        Load the prebuilt company index, (re)building it from company_tickers.json
+        only when it is missing or older than the cached tickers payload
+        """
+        name = "company_tickers.json"
+        state = self.cache.freshness(name)
+        built_from = self._index.built_from()
+
+        if built_from is None or state in ("missing", "expired") or built_from < self.cache.load_meta(name)["fetched_at"]:
+            raw = self._get_cached_json(self.cik_json_url, name, ttl=Config.SEC_TICKERS_TTL)
+            self._index.build(raw, source_fetched_at=self.cache.load_meta(name)["fetched_at"])
+        elif state == "stale":
+            self._revalidate_in_background(self.cik_json_url, name, ttl=Config.SEC_TICKERS_TTL)
+
+        self._index.load()
+
+    def _ensure_company_index(self) -> None:
+        if self._index.loaded:
+            return
+        with self._index_lock:
+            if not self._index.loaded:
+                self._build_company_index()
 
-        return val
+    def warm_up(self) -> None:
+        """Eagerly load the company index so the first lookup after boot is fast"""
+        try:
+            self._ensure_company_index()
+        except Exception as e:
+            print(f"Warning: SEC company index warm-up failed: {e}")
 
     def _get_company_facts(self, cik: str) -> Dict[str, Any]:
         """Get company facts from SEC API"""
         cik_padded = str(int(cik)).zfill(10)
         url = f"https://data.sec.gov/api/xbrl/companyfacts/CIK{cik_padded}.json"
-        cache_path = os.path.join(self.cache_dir, f"companyfacts_{cik_padded}.json")
-
-        return self._fetch_json(url, save_path=cache_path)
-
-    def _extract_key_financials(self, company_facts_json: Dict[str, Any]) -> Dict[str, Any]:
-        """Extract key financial metrics from company facts"""
-        target_keywords = {
-            "TotalAssets": ["Assets", "AssetsTotal"],
-            "TotalLiabilities": ["Liabilities", "LiabilitiesAndStockholdersEquity", "LiabilitiesTotal"],
-            "Revenues": ["Revenues", "SalesRevenueNet", "RevenueFromContractWithCustomerExcludingAssessedTax"],
-            "NetIncomeLoss": ["NetIncomeLoss", "NetIncomeLossAvailableToCommonStockholdersBasic"],
-            "CashAndCashEquivalents": ["CashAndCashEquivalentsAtCarryingValue", "CashAndCashEquivalents"]
-        }
 
-        found = {}
-        facts = company_facts_json.get("facts", {})
-
-        for ns, ns_obj in facts.items():
-            for tag, tag_obj in ns_obj.items():
-                lt = tag.lower()
-
-                for k, variants in target_keywords.items():
-                    for var in variants:
-                        if var.lower() in lt:
-                            units = tag_obj.get("units", {})
-                            chosen_unit = None
-
-                            if "USD" in units:
-                                chosen_unit = "USD"
-                            elif units:
-                                chosen_unit = list(units.keys())[0]
-
-                            if not chosen_unit:
-                                continue
-
-                            entries = units.get(chosen_unit, [])
-                            if not entries:
-                                continue
-
-                            entries_sorted = sorted(entries, key=lambda e: e.get("end") or "", reverse=True)
-
-                            for entry in entries_sorted:
-                                num = self._numeric_from_entry(entry)
-                                if num is not None:
-                                    found[k] = {
-                                        "value": num,
-                                        "unit": chosen_unit,
-                                        "end": entry.get("end")
-                                    }
-                                    break
-
-        return found
-
-    def _numeric_from_entry(self, entry: Dict[str, Any]) -> Optional[float]:
-        """Extract numeric value from entry"""
-        for k in ("v", "val", "value", "amount"):
-            if k in entry:
-                return self._parse_number_from_str(entry.get(k))
-
-        for k, v in entry.items():
-            if isinstance(v, (int, float)):
-                return float(v)
-            if isinstance(v, str) and re.search(r"[\d\.,\(\)]", v):
-                nn = self._parse_number_from_str(v)
-                if nn is not None:
-                    return nn
+        return self._get_cached_json(
+            url,
+            f"companyfacts_{cik_padded}.json",
+            ttl=Config.SEC_FACTS_TTL,
+            stream_parser=stream_tracked_facts,
+        )
 
-        return None
+    def _get_financials_record(self, cik: str) -> Dict[str, Any]:
+        """
+        Serve the compact financials record for a CIK from the store, ingesting
+        the companyfacts document only when the record is missing or older than its TTL
+        """
+        record = self.financials_store.get(cik)
+        if record is not None and time.time() - record["ingested_at"] < Config.SEC_FACTS_TTL:
+            return record
+
+        try:
+            company_facts = self._get_company_facts(cik)
+        except Exception:
+            if record is not None:
+                return record
+            raise
+
+        return self.ingest_company_facts(cik, company_facts)
+
+    def ingest_company_facts(self, cik: str, company_facts_json: Dict[str, Any]) -> Dict[str, Any]:
+        """Reduce a companyfacts document and persist it to the financials store"""
+        self.financials_store.put(cik, reduce_company_facts(company_facts_json))
+        return self.financials_store.get(cik)
+
+    def ingest_cached_company_facts(self, ciks: Optional[List[str]] = None) -> int:
+        """Ingest companyfacts documents already present in the SEC cache directory"""
+        pattern = re.compile(r"^companyfacts_(\d{10})\.json$")
+        wanted = {str(int(c)) for c in ciks} if ciks else None
+
+        count = 0
+        for filename in self.cache.names():
+            match = pattern.match(filename)
+            if not match:
+                continue
+
+            cik = str(int(match.group(1)))
+            if wanted is not None and cik not in wanted:
+                continue
+
+            company_facts = self.cache.load(filename)
+            if company_facts is None:
+                continue
+
+            self.ingest_company_facts(cik, company_facts)
+            count += 1
+
+        return count
+
+    def _lookup_cache_key(self, company_name: str, threshold: int) -> Tuple[str, int]:
+        return (" ".join(company_name.lower().split()), threshold)
+
+    def _cache_lookup_result(self, cache_key: Tuple[str, int], result: Dict[str, Any]) -> None:
+        # Only cache answers, not transient failures (network, SEC outages)
+        if result.get("success") or result.get("suggestions"):
+            self.lookup_cache.set(cache_key, copy.deepcopy(result))
 
     def lookup_company(self, company_name: str, threshold: int = 85) -> Dict[str, Any]:
         """
-        Look up company by name/ticker and return financial data
+        Look up company by name/ticker and return financial data.
+        Results are cached in-process per (normalized query, threshold).
         
         Returns:
         {
@@ -181,6 +283,7 @@ class SECLookupService:
             "data": {
                 "company_name": str,
                 "ticker": str,
+                "tickers": list of str,
                 "cik": str,
                 "financials": dict,
                 "match_score": int
@@ -189,100 +292,86 @@ class SECLookupService:
             "suggestions": list of suggested matches
         }
         """
-        try:
-            if self._company_index is None:
-                self._build_company_index()
-
-            query = company_name.strip()
+        cache_key = self._lookup_cache_key(company_name, threshold)
+        cached = self.lookup_cache.get(cache_key)
+        if cached is not None:
+            return copy.deepcopy(cached)
 
-            if query.upper() in self._ticker_to_cik:
-                cik = self._ticker_to_cik[query.upper()]
-                return self._get_company_data(cik, query.upper(), 100)
+        result = self._lookup_company_uncached(company_name, threshold)
+        self._cache_lookup_result(cache_key, result)
 
-            if query.lower() in self._name_to_cik:
-                cik = self._name_to_cik[query.lower()]
-                return self._get_company_data(cik, query, 100)
+        return result
 
-            wratio_matches = process.extract(query, self._choices, scorer=fuzz.WRatio, limit=10)
-            partial_matches = process.extract(query, self._choices, scorer=fuzz.partial_ratio, limit=10)
-            token_matches = process.extract(query, self._choices, scorer=fuzz.token_sort_ratio, limit=10)
+    def _resolve_exact(self, query: str) -> Optional[Tuple[str, str, int]]:
+        """(cik, matched_name, score) for an exact ticker, exact title or curated alias"""
+        cik = self._index.cik_for_ticker(query)
+        if cik:
+            return cik, query.upper(), 100
 
-            all_matches = {}
-            for match_list in [wratio_matches, partial_matches, token_matches]:
-                for name, score, idx in match_list:
-                    if name in all_matches:
-                        all_matches[name] = max(all_matches[name], score)
-                    else:
-                        all_matches[name] = score
+        cik = self._index.cik_for_name(query)
+        if cik:
+            return cik, query, 100
 
-            matches = [(name, score, 0) for name, score in sorted(all_matches.items(), key=lambda x: x[1], reverse=True)][:5]
+        alias_ticker = resolve_alias(query)
+        cik = self._index.cik_for_ticker(alias_ticker) if alias_ticker else None
+        if cik:
+            return cik, alias_ticker, 100
 
-            if not matches:
-                return {
-                    "success": False,
-                    "error": "No companies found matching your search",
-                    "suggestions": []
-                }
-
-            best_match, best_score, _ = matches[0]
+        return None
 
-            if len(query) >= 4:
-                try:
-                    from .gemini_service import GeminiFinancialExtractor
-                    gemini = GeminiFinancialExtractor()
-
-                    available_companies = [r["title"] for r in self._company_index]
-                    gemini_result = gemini.resolve_company_name(query, available_companies)
-
-                    if gemini_result["success"] and gemini_result["suggestions"]:
-                        top_suggestion = gemini_result["suggestions"][0]
-                        if top_suggestion["confidence"] >= 85:
-                            suggested_name = top_suggestion["company_name"]
-                            if suggested_name.lower() in self._name_to_cik:
-                                cik = self._name_to_cik[suggested_name.lower()]
-                                return self._get_company_data(cik, suggested_name, top_suggestion["confidence"])
-
-                        gemini_suggestions = []
-                        for suggestion in gemini_result["suggestions"]:
-                            gemini_suggestions.append({
-                                "name": suggestion["company_name"],
-                                "score": suggestion["confidence"],
-                                "reason": suggestion.get("reason", "")
-                            })
-
-                        return {
-                            "success": False,
-                            "error": "Multiple possible matches found (AI-assisted)",
-                            "suggestions": gemini_suggestions
-                        }
-                except Exception as e:
-                    print(f"Gemini resolution failed: {e}")
+    def _resolve_match(self, matches: List[Tuple[str, float, int]], threshold: int) -> Optional[Tuple[str, str, float]]:
+        """(cik, matched_name, score) for the best fuzzy match if it clears the threshold"""
+        if not matches or matches[0][1] < threshold:
+            return None
 
-            if best_score >= threshold:
-                if best_match.upper() in self._ticker_to_cik:
-                    cik = self._ticker_to_cik[best_match.upper()]
-                else:
-                    cik = self._name_to_cik.get(best_match.lower())
+        best_match, best_score, _ = matches[0]
+        cik = self._index.cik_for_ticker(best_match) or self._index.cik_for_name(best_match)
+        return (cik, best_match, best_score) if cik else None
 
-                if cik:
-                    return self._get_company_data(cik, best_match, best_score)
+    def _unresolved_response(self, query: str, matches: List[Tuple[str, float, int]]) -> Dict[str, Any]:
+        """Gemini fallback or suggestions for a query no local match resolved"""
+        best_score = matches[0][1] if matches else 0
 
-            suggestion_matches = [(name, score) for name, score, _ in matches if score >= 40]
-            suggestions = [{"name": match[0], "score": match[1]} for match in suggestion_matches]
+        # The LLM is a last resort for queries nothing local resembles
+        if len(query) >= 4 and best_score < Config.SEC_LLM_FALLBACK_SCORE:
+            gemini_response = self._resolve_with_gemini(query)
+            if gemini_response:
+                return gemini_response
 
-            if not suggestions:
-                return {
-                    "success": False,
-                    "error": "No companies found matching your search",
-                    "suggestions": []
-                }
+        suggestion_matches = [(name, score) for name, score, _ in matches if score >= 40]
+        suggestions = [{"name": match[0], "score": match[1]} for match in suggestion_matches]
 
+        if not suggestions:
             return {
                 "success": False,
-                "error": "Multiple possible matches found",
-                "suggestions": suggestions
+                "error": "No companies found matching your search",
+                "suggestions": []
             }
 
+        return {
+            "success": False,
+            "error": "Multiple possible matches found",
+            "suggestions": suggestions
+        }
+
+    def _lookup_company_uncached(self, company_name: str, threshold: int) -> Dict[str, Any]:
+        """Resolve a query and fetch its company data, bypassing the result cache"""
+        try:
+            self._ensure_company_index()
+
+            query = company_name.strip()
+
+            resolved = self._resolve_exact(query)
+            if resolved:
+                return self._get_company_data(*resolved)
+
+            matches = self._index.matcher.match(query, limit=5)
+            resolved = self._resolve_match(matches, threshold)
+            if resolved:
+                return self._get_company_data(*resolved)
+
+            return self._unresolved_response(query, matches)
+
         except Exception as e:
             return {
                 "success": False,
@@ -290,17 +379,128 @@ class SECLookupService:
                 "suggestions": []
             }
 
-    def _get_company_data(self, cik: str, matched_name: str, score: int) -> Dict[str, Any]:
-        """Get complete company data for a CIK"""
+    def lookup_companies(self, company_names: List[str], threshold: int = 85) -> List[Dict[str, Any]]:
+        """
+        Batch variant of lookup_company, returning one result per input in input order.
+
+        Unresolved names share a single vectorized fuzzy pass, each distinct CIK is
+        fetched once, and fetches run concurrently under the shared SEC rate limit.
+        Names that still need the Gemini fallback are resolved concurrently as well.
+        """
+        results = {}
+        resolved = {}
+        pending = []
+        from_cache = set()
+
         try:
-            company_facts = self._get_company_facts(cik)
+            self._ensure_company_index()
+        except Exception as e:
+            failure = {"success": False, "error": f"Lookup failed: {str(e)}", "suggestions": []}
+            return [dict(failure) for _ in company_names]
+
+        queries = list(dict.fromkeys(name.strip() for name in company_names))
+        for query in queries:
+            cached = self.lookup_cache.get(self._lookup_cache_key(query, threshold))
+            if cached is not None:
+                results[query] = cached
+                from_cache.add(query)
+                continue
+
+            exact = self._resolve_exact(query)
+            if exact:
+                resolved[query] = exact
+            else:
+                pending.append(query)
+
+        unresolved = []
+        for query, matches in zip(pending, self._index.matcher.match_many(pending, limit=5)):
+            match = self._resolve_match(matches, threshold)
+            if match:
+                resolved[query] = match
+            else:
+                unresolved.append((query, matches))
+
+        if unresolved:
+            with ThreadPoolExecutor(max_workers=min(Config.SEC_LLM_BATCH_WORKERS, len(unresolved))) as executor:
+                responses = executor.map(lambda item: self._unresolved_response(*item), unresolved)
+                for (query, _), response in zip(unresolved, responses):
+                    results[query] = response
+
+        records = {}
+        ciks = list(dict.fromkeys(cik for cik, _, _ in resolved.values()))
+        if ciks:
+            def fetch(cik):
+                try:
+                    return cik, self._get_financials_record(cik)
+                except Exception as e:
+                    return cik, e
+
+            with ThreadPoolExecutor(max_workers=min(Config.SEC_BATCH_WORKERS, len(ciks))) as executor:
+                records = dict(executor.map(fetch, ciks))
+
+        for query, (cik, matched_name, score) in resolved.items():
+            results[query] = self._get_company_data(cik, matched_name, score, record=records[cik])
+
+        for query in queries:
+            if query in from_cache:
+                continue
+            self._cache_lookup_result(self._lookup_cache_key(query, threshold), results[query])
+
+        return [copy.deepcopy(results[name.strip()]) for name in company_names]
+
+    def _resolve_with_gemini(self, query: str) -> Optional[Dict[str, Any]]:
+        """Ask Gemini to resolve a query the local index could not; None if it cannot help"""
+        try:
+            with self._gemini_lock:
+                if self._gemini is None:
+                    from .gemini_service import GeminiFinancialExtractor
+                    self._gemini = GeminiFinancialExtractor()
+
+            gemini_result = self._gemini.resolve_company_name(query, self._index.titles)
+
+            if gemini_result["success"] and gemini_result["suggestions"]:
+                top_suggestion = gemini_result["suggestions"][0]
+                if top_suggestion["confidence"] >= 85:
+                    suggested_name = top_suggestion["company_name"]
+                    cik = self._index.cik_for_name(suggested_name)
+                    if cik:
+                        return self._get_company_data(cik, suggested_name, top_suggestion["confidence"])
+
+                gemini_suggestions = []
+                for suggestion in gemini_result["suggestions"]:
+                    gemini_suggestions.append({
+                        "name": suggestion["company_name"],
+                        "score": suggestion["confidence"],
+                        "reason": suggestion.get("reason", "")
+                    })
+
+                return {
+                    "success": False,
+                    "error": "Multiple possible matches found (AI-assisted)",
+                    "suggestions": gemini_suggestions
+                }
+        except Exception as e:
+            print(f"Gemini resolution failed: {e}")
+
+        return None
+
+    def _get_company_data(
+        self, cik: str, matched_name: str, score: int, record: Optional[Any] = None
+    ) -> Dict[str, Any]:
+        """Get complete company data for a CIK, optionally from an already fetched record (or its fetch error)"""
+        try:
+            if isinstance(record, Exception):
+                raise record
+            if record is None:
+                record = self._get_financials_record(cik)
+            financials = record["latest"]
 
-            financials = self._extract_key_financials(company_facts)
+            company_info = self._index.record_for_cik(cik) or {"title": matched_name, "ticker": "", "tickers": [], "cik": cik}
 
-            company_info = next(
-                (r for r in self._company_index if r["cik"] == cik),
-                {"title": matched_name, "ticker": "", "cik": cik}
-            )
+            # Report the share class the user asked for when they matched on a secondary ticker
+            ticker = company_info["ticker"]
+            if matched_name.upper() in company_info["tickers"]:
+                ticker = matched_name.upper()
 
             def get_financial_value(key):
                 return financials.get(key, {}).get("value")
@@ -311,6 +511,7 @@ class SECLookupService:
                 "total_assets": get_financial_value("TotalAssets"),
                 "total_liabilities": get_financial_value("TotalLiabilities"),
                 "cash_and_equivalents": get_financial_value("CashAndCashEquivalents"),
+                "history": record["history"],
                 "raw_data": financials
             }
 
@@ -318,7 +519,8 @@ class SECLookupService:
                 "success": True,
                 "data": {
                     "company_name": company_info["title"],
-                    "ticker": company_info["ticker"],
+                    "ticker": ticker,
+                    "tickers": company_info["tickers"],
                     "cik": cik,
                     "financials": formatted_financials,
                     "match_score": score,
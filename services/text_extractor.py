@@ -1,65 +1,336 @@
+import io
 import os
+import re
+import math
+import time
+import signal
+import tempfile
+import threading
+from datetime import date, datetime, time as dt_time
 import docx
-from PyPDF2 import PdfReader
+import openpyxl
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from PyPDF2.errors import PdfReadError, FileNotDecryptedError
+import numpy as np
 import pandas as pd
+from config import Config
+from .pdf_backends import PDFBackend, get_pdf_backend
+from .extraction_cache import extraction_cache
+
+
+# Statement headings and line items, in English and Georgian. Georgian entries are
+# stems, since inflected forms (აქტივები, აქტივების, ...) share them
+FINANCIAL_KEYWORDS = (
+    "balance sheet", "statement of financial position", "income statement",
+    "statement of operations", "profit or loss", "comprehensive income",
+    "cash flow", "changes in equity", "total assets", "total liabilities",
+    "shareholders' equity", "stockholders' equity", "retained earnings",
+    "revenue", "net income", "net loss", "gross profit", "operating income",
+    "operating expenses", "cost of sales", "ebitda", "earnings per share",
+    "receivable", "payable", "inventor", "borrowings", "depreciation", "amortization",
+    "ფინანსური მდგომარეობ", "ანგარიშგებ", "ბალანს", "აქტივ", "ვალდებულებ",
+    "კაპიტალ", "შემოსავ", "მოგებ", "ზარალ", "ფულადი ნაკად", "ხარჯ",
+    "სავაჭრო", "დებიტორ", "კრედიტორ", "სესხ", "მარაგ", "ამორტიზაც", "ცვეთ",
+)
+_KEYWORD_PATTERN = re.compile("|".join(re.escape(k) for k in FINANCIAL_KEYWORDS), re.IGNORECASE)
+_NUMBER_PATTERN = re.compile(r"^[(\-–]?[$€£₾]?\d[\d,.\s]*%?\)?$")
+
+
+def score_financial_section(text: str) -> float:
+    """
+    Statement-likeness of a page or section: the share of numeric tokens,
+    boosted by financial keywords (up to 2x at four or more hits)
+    """
+    tokens = text.split()
+    if not tokens:
+        return 0.0
+
+    numeric = sum(1 for token in tokens if _NUMBER_PATTERN.match(token))
+    hits = len(_KEYWORD_PATTERN.findall(text))
+    return (numeric / len(tokens)) * (1 + 0.25 * min(hits, 4))
+
+
+class PageTimeoutError(BaseException):
+    """Raised by SIGALRM; a BaseException so PyPDF2's broad ``except Exception`` blocks can't swallow it"""
+
+
+def _raise_page_timeout(signum, frame):
+    raise PageTimeoutError()
+
+
+def _iter_pdf_pages(
+    backend: PDFBackend, document: Any, start: int, end: int, page_timeout: float
+) -> Iterator[Tuple[int, Optional[str]]]:
+    """
+    Extract pages [start, end) as (page_num, text) pairs; text is None for pages that failed.
+
+    The per-page timeout relies on SIGALRM, so it is only enforced on POSIX and
+    in a process's main thread (i.e. inside pool workers, not request threads).
+    """
+    use_alarm = (
+        page_timeout > 0
+        and hasattr(signal, "setitimer")
+        and threading.current_thread() is threading.main_thread()
+    )
+    if use_alarm:
+        previous_handler = signal.signal(signal.SIGALRM, _raise_page_timeout)
+
+    try:
+        # Resolve page objects up front: interrupting PyPDF2 while it flattens the
+        # page tree would leave the reader unusable for the remaining pages
+        all_pages = backend.pages(document)
+        page_objects = [all_pages[page_num] for page_num in range(start, end)]
+
+        for page_num, page in zip(range(start, end), page_objects):
+            page_text = None
+            try:
+                if use_alarm:
+                    signal.setitimer(signal.ITIMER_REAL, page_timeout)
+                page_text = backend.page_text(page)
+                if use_alarm:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+            except PageTimeoutError:
+                print(f"Warning: Timed out extracting text from page {page_num + 1} after {page_timeout}s")
+            except Exception as e:
+                print(f"Warning: Could not extract text from page {page_num + 1}: {str(e)}")
+            finally:
+                if use_alarm:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+
+            yield page_num, page_text
+    finally:
+        if use_alarm:
+            signal.signal(signal.SIGALRM, previous_handler)
+
+
+def _extract_pdf_pages(
+    backend: PDFBackend, document: Any, start: int, end: int, page_timeout: float
+) -> List[Tuple[int, Optional[str]]]:
+    return list(_iter_pdf_pages(backend, document, start, end, page_timeout))
+
+
+def _extract_pdf_page_range(
+    backend_name: str, source: Union[str, bytes], start: int, end: int, page_timeout: float
+) -> List[Tuple[int, Optional[str]]]:
+    """Process pool worker: each worker parses the PDF itself and extracts one page range"""
+    backend = get_pdf_backend(backend_name)
+    document = backend.open(source)
+    try:
+        return _extract_pdf_pages(backend, document, start, end, page_timeout)
+    finally:
+        backend.close(document)
+
+
+_pdf_pool = None
+_pdf_pool_workers = 0
+_pdf_pool_lock = threading.Lock()
+
+
+def _get_pdf_pool(workers: int) -> ProcessPoolExecutor:
+    """The shared page-range pool, created on first use so the server forks its workers once"""
+    global _pdf_pool, _pdf_pool_workers
+    with _pdf_pool_lock:
+        if _pdf_pool is None or _pdf_pool_workers != workers:
+            if _pdf_pool is not None:
+                _pdf_pool.shutdown(wait=True)
+            _pdf_pool = ProcessPoolExecutor(max_workers=workers)
+            _pdf_pool_workers = workers
+        return _pdf_pool
+
+
+def _retire_pdf_pool(pool: ProcessPoolExecutor) -> None:
+    """Replace a pool whose worker hung or died; the next call starts a fresh one"""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is pool:
+            _pdf_pool = None
+    pool.shutdown(wait=False)
 
 
 class TextExtractor:
+    # Bump whenever extraction output changes, so cached extractions are not reused
+    EXTRACTOR_VERSION = 1
+    # Paragraph and line chunks are grouped up to roughly this many characters
+    CHUNK_CHARS = 16 * 1024
+    # Non-PDF text is scored for financial content in blocks of this many lines
+    SECTION_LINES = 60
+
     @staticmethod
-    def extract_text_from_file(file_path: str) -> str:
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"File not found: {file_path}")
+    def extract_text_from_file(source: Union[str, bytes], filename: Optional[str] = None) -> str:
+        return "\n".join(chunk["text"] for chunk in TextExtractor.iter_text_chunks(source, filename))
 
-        _, ext = os.path.splitext(file_path)
+    @staticmethod
+    def iter_text_chunks(source: Union[str, bytes], filename: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield a document's cleaned text as chunks with source metadata:
+        {"source": filename, "kind": "page" | "paragraphs" | "lines" | "sheet",
+        "locator": page/paragraph/line number or sheet name, "text": str}.
+
+        source is a file path or the file's bytes; filename supplies the file type
+        and chunk source name, and is required for bytes. Joining every chunk's
+        text with newlines gives extract_text_from_file().
+        """
+        if isinstance(source, (bytearray, memoryview)):
+            source = bytes(source)
+
+        if isinstance(source, bytes):
+            if not filename:
+                raise ValueError("A filename is required to extract text from file contents")
+        elif not os.path.exists(source):
+            raise FileNotFoundError(f"File not found: {source}")
+
+        filename = filename or os.path.basename(source)
+        _, ext = os.path.splitext(filename)
         ext = ext.lower()
 
         extractors = {
-            ".pdf": TextExtractor._extract_from_pdf,
-            ".docx": TextExtractor._extract_from_docx,
-            ".txt": TextExtractor._extract_from_txt,
-            ".xlsx": TextExtractor._extract_from_excel,
-            ".xls": TextExtractor._extract_from_excel,
+            ".pdf": (TextExtractor._iter_pdf, "No text could be extracted from PDF"),
+            ".docx": (TextExtractor._iter_docx, "No text could be extracted from DOCX file"),
+            ".txt": (TextExtractor._iter_txt, "Text file is empty"),
+            ".xlsx": (TextExtractor._iter_xlsx, "No data could be extracted from Excel file"),
+            ".xls": (TextExtractor._iter_excel, "No data could be extracted from Excel file"),
         }
 
         if ext not in extractors:
             raise ValueError(f"Unsupported file type: {ext}")
 
+        extractor, empty_error = extractors[ext]
+
+        cache_key = None
+        if extraction_cache is not None:
+            cache_key = extraction_cache.key_for(source, TextExtractor._cache_variant(ext))
+            cached = extraction_cache.get(cache_key)
+            if cached is not None:
+                for chunk in cached:
+                    yield {**chunk, "source": filename}
+                return
+
+        # Extractors yield None text for parts that failed (e.g. a timed-out page);
+        # such partial extractions are returned but never cached
+        collected = []
+        complete = True
         try:
-            text = extractors[ext](file_path)
-            return TextExtractor._clean_text(text)
+            for kind, locator, raw_text in extractor(source):
+                if raw_text is None:
+                    complete = False
+                    continue
+                text = TextExtractor._clean_text(raw_text)
+                if text:
+                    chunk = {"source": filename, "kind": kind, "locator": locator, "text": text}
+                    collected.append(chunk)
+                    yield chunk
+
+            if not collected:
+                raise ValueError(empty_error)
         except Exception as e:
             raise RuntimeError(f"Error extracting text from {ext} file: {str(e)}")
 
+        if cache_key is not None and complete:
+            extraction_cache.set(cache_key, collected)
+
     @staticmethod
-    def _extract_from_pdf(file_path: str) -> str:
-        text = ""
+    def _cache_variant(ext: str) -> str:
+        """Everything besides the file bytes that changes extracted text for this file type"""
+        settings = [f"v{TextExtractor.EXTRACTOR_VERSION}", ext, str(TextExtractor.CHUNK_CHARS)]
+        if ext == ".pdf":
+            # The backend that will run, not the configured name, which may fall back to PyPDF2
+            settings.append(get_pdf_backend(Config.PDF_BACKEND).name)
+        elif ext in (".xlsx", ".xls"):
+            settings += [
+                str(Config.EXCEL_STREAMING_MIN_BYTES), str(Config.EXCEL_MAX_ROWS), str(Config.EXCEL_MAX_CHARS),
+            ]
+        return ":".join(settings)
 
-        try:
-            reader = PdfReader(file_path)
+    @staticmethod
+    def _split_sections(chunks: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """PDF pages are sections as-is; other chunks are cut into SECTION_LINES-line blocks"""
+        sections = []
+        for chunk in chunks:
+            if chunk["kind"] == "page":
+                sections.append(chunk)
+                continue
+
+            lines = chunk["text"].split("\n")
+            for start in range(0, len(lines), TextExtractor.SECTION_LINES):
+                sections.append({**chunk, "text": "\n".join(lines[start:start + TextExtractor.SECTION_LINES])})
+        return sections
 
-            if reader.is_encrypted:
-                try:
-                    reader.decrypt("")
-                except Exception:
-                    raise ValueError("PDF is password-protected and cannot be read without the password")
+    @staticmethod
+    def select_financial_text(
+        chunks: Iterable[Dict[str, Any]],
+        min_chars: Optional[int] = None,
+        context: Optional[int] = None,
+        min_score: Optional[float] = None,
+    ) -> str:
+        """
+        Shrink a document to its statement-like sections before prompting.
+
+        Sections scoring at least min_score are kept together with `context`
+        neighbouring sections on each side; omitted runs are replaced by a marker.
+        Documents shorter than min_chars, or where nothing scores, are returned whole.
+        """
+        min_chars = Config.FINANCIAL_FILTER_MIN_CHARS if min_chars is None else min_chars
+        context = Config.FINANCIAL_SECTION_CONTEXT if context is None else context
+        min_score = Config.FINANCIAL_SECTION_MIN_SCORE if min_score is None else min_score
+
+        sections = TextExtractor._split_sections(chunks)
+        full_text = "\n".join(section["text"] for section in sections)
+        if len(full_text) < min_chars:
+            return full_text
+
+        selected = [score_financial_section(section["text"]) >= min_score for section in sections]
+        if not any(selected):
+            return full_text
+
+        keep = [
+            any(selected[max(0, i - context):i + context + 1])
+            for i in range(len(sections))
+        ]
+
+        parts = []
+        omitted = 0
+        for section, kept in zip(sections, keep):
+            if kept:
+                if omitted:
+                    parts.append(f"[... {omitted} non-financial section(s) omitted ...]")
+                    omitted = 0
+                parts.append(section["text"])
+            else:
+                omitted += 1
+        if omitted:
+            parts.append(f"[... {omitted} non-financial section(s) omitted ...]")
 
-            if len(reader.pages) == 0:
-                raise ValueError("PDF file contains no pages")
+        return "\n".join(parts)
 
-            for page_num, page in enumerate(reader.pages):
-                try:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-                except Exception as e:
-                    print(f"Warning: Could not extract text from page {page_num + 1}: {str(e)}")
-                    continue
+    @staticmethod
+    def _as_file(source: Union[str, bytes]) -> Union[str, io.BytesIO]:
+        """A path or a binary stream over the bytes, for libraries that accept either"""
+        return io.BytesIO(source) if isinstance(source, bytes) else source
+
+    @staticmethod
+    def _iter_pdf(source: Union[str, bytes]) -> Iterator[Tuple[str, int, Optional[str]]]:
+        try:
+            backend = get_pdf_backend(Config.PDF_BACKEND)
+            document = backend.open(source)
+            try:
+                page_count = len(backend.pages(document))
+
+                if page_count == 0:
+                    raise ValueError("PDF file contains no pages")
 
-            if not text.strip():
-                raise ValueError("No text could be extracted from PDF")
+                workers = Config.PDF_EXTRACT_WORKERS or os.cpu_count() or 1
+                if workers > 1 and page_count >= Config.PDF_PARALLEL_MIN_PAGES:
+                    pages = TextExtractor._extract_pdf_pages_parallel(backend.name, source, page_count, workers)
+                else:
+                    pages = _iter_pdf_pages(backend, document, 0, page_count, Config.PDF_PAGE_TIMEOUT)
 
-            return text
+                for page_num, page_text in pages:
+                    if page_text is None or page_text:
+                        yield "page", page_num + 1, page_text
+            finally:
+                backend.close(document)
 
         except FileNotDecryptedError:
             raise ValueError("PDF is encrypted and requires a password")
@@ -77,67 +348,264 @@ class TextExtractor:
                 raise ValueError(f"Error reading PDF file: {str(e)}")
 
     @staticmethod
-    def _extract_from_docx(file_path: str) -> str:
-        text = ""
-        doc = docx.Document(file_path)
+    def _extract_pdf_pages_parallel(
+        backend_name: str, source: Union[str, bytes], page_count: int, workers: int
+    ) -> List[Tuple[int, Optional[str]]]:
+        """
+        Extract page ranges in a process pool and reassemble them in page order.
+        Ranges are smaller than page_count / workers so slow pages don't leave cores idle.
+        Pages of a range that timed out or failed are returned with None text.
+
+        In-memory PDFs are written to a temporary file first, so workers open the
+        path instead of every range task pickling a copy of the bytes.
+        """
+        if isinstance(source, bytes):
+            fd, path = tempfile.mkstemp(prefix="pdf_pages_", suffix=".pdf")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(source)
+                return TextExtractor._extract_pdf_pages_parallel(backend_name, path, page_count, workers)
+            finally:
+                os.remove(path)
+
+        page_timeout = Config.PDF_PAGE_TIMEOUT
+        range_size = max(1, math.ceil(page_count / (workers * 4)))
+        ranges = [(start, min(start + range_size, page_count)) for start in range(0, page_count, range_size)]
+
+        # Backstop for a worker that hangs outside the per-page alarm: never wait
+        # longer than extracting every page sequentially, each hitting its timeout
+        deadline = time.monotonic() + page_timeout * (page_count + 1) if page_timeout > 0 else None
+
+        executor = _get_pdf_pool(workers)
+        futures = [
+            (executor.submit(_extract_pdf_page_range, backend_name, source, start, end, page_timeout), start, end)
+            for start, end in ranges
+        ]
+        pages = []
+        broken = False
+        try:
+            for future, start, end in futures:
+                try:
+                    remaining = max(0.0, deadline - time.monotonic()) if deadline is not None else None
+                    pages.extend(future.result(timeout=remaining))
+                    continue
+                except FuturesTimeoutError:
+                    print(f"Warning: Timed out extracting text from pages {start + 1}-{end}")
+                    broken = True
+                except BrokenProcessPool as e:
+                    print(f"Warning: Could not extract text from pages {start + 1}-{end}: {str(e)}")
+                    broken = True
+                except Exception as e:
+                    print(f"Warning: Could not extract text from pages {start + 1}-{end}: {str(e)}")
+                pages.extend((page_num, None) for page_num in range(start, end))
+        finally:
+            # Other requests share the pool, so only this call's queued ranges are cancelled
+            for future, _, _ in futures:
+                future.cancel()
+            if broken:
+                _retire_pdf_pool(executor)
+
+        return pages
+
+    @staticmethod
+    def _iter_grouped(lines: Iterator[str], kind: str) -> Iterator[Tuple[str, int, str]]:
+        """Group lines into chunks of about CHUNK_CHARS, located by their first line (1-based)"""
+        buffer = []
+        size = 0
+        first = 1
+        for number, line in enumerate(lines, start=1):
+            if not buffer:
+                first = number
+            buffer.append(line)
+            size += len(line)
+            if size >= TextExtractor.CHUNK_CHARS:
+                yield kind, first, "\n".join(buffer)
+                buffer = []
+                size = 0
+
+        if buffer:
+            yield kind, first, "\n".join(buffer)
 
-        for para in doc.paragraphs:
-            if para.text.strip():
-                text += para.text + "\n"
+    @staticmethod
+    def _iter_docx(source: Union[str, bytes]) -> Iterator[Tuple[str, int, str]]:
+        doc = docx.Document(TextExtractor._as_file(source))
+        yield from TextExtractor._iter_grouped((para.text for para in doc.paragraphs), "paragraphs")
 
-        if not text.strip():
-            raise ValueError("No text could be extracted from DOCX file")
+    @staticmethod
+    def _iter_txt(source: Union[str, bytes]) -> Iterator[Tuple[str, int, str]]:
+        if isinstance(source, bytes):
+            f = io.TextIOWrapper(io.BytesIO(source), encoding="utf-8", errors="ignore")
+        else:
+            f = open(source, "r", encoding="utf-8", errors="ignore")
+        with f:
+            yield from TextExtractor._iter_grouped(f, "lines")
 
-        return text
+    @staticmethod
+    def _iter_xlsx(source: Union[str, bytes]) -> Iterator[Tuple[str, str, str]]:
+        size = len(source) if isinstance(source, bytes) else os.path.getsize(source)
+        if size >= Config.EXCEL_STREAMING_MIN_BYTES:
+            yield from TextExtractor._iter_excel_streaming(source)
+        else:
+            yield from TextExtractor._iter_excel(source)
 
     @staticmethod
-    def _extract_from_txt(file_path: str) -> str:
-        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-            text = f.read()
+    def _iter_excel(source: Union[str, bytes]) -> Iterator[Tuple[str, str, str]]:
+        try:
+            # sheet_name=None parses the workbook once and returns every sheet
+            sheets = pd.read_excel(TextExtractor._as_file(source), sheet_name=None)
 
-        if not text.strip():
-            raise ValueError("Text file is empty")
+            for sheet_name, df in sheets.items():
+                yield "sheet", sheet_name, TextExtractor._render_sheet(sheet_name, df)
 
-        return text
+        except Exception as e:
+            raise RuntimeError(f"Error reading Excel file: {str(e)}")
+
+    @staticmethod
+    def _render_sheet(sheet_name: str, df: pd.DataFrame) -> str:
+        """
+        Render a sheet as "col: value | col: value" lines, skipping empty cells.
+
+        Cells are formatted column by column with vectorized string ops; only the
+        final per-row join runs in Python.
+        """
+        parts = [f"\n--- SHEET: {sheet_name} ---\n\n"]
+
+        if df.empty:
+            parts.append("Sheet is empty\n\n")
+            return "".join(parts)
+
+        headers = " | ".join(
+            str(col) for col in df.columns if pd.notna(col)
+        )
+        if headers.strip():
+            parts.append(f"Columns: {headers}\n\n")
+
+        cells = []
+        for position in range(df.shape[1]):
+            column = df.iloc[:, position]
+            # astype(str) drops the time from all-midnight datetimes; str() per value keeps it
+            text = column.map(str) if pd.api.types.is_datetime64_any_dtype(column) else column.astype(str)
+            present = column.notna().to_numpy() & (text.str.strip() != "").to_numpy()
+            cells.append(np.where(present, f"{df.columns[position]}: " + text.to_numpy(dtype=object), ""))
+
+        for row in zip(*cells):
+            row_text = " | ".join(filter(None, row))
+            if row_text:
+                parts.append(row_text + "\n")
+
+        parts.append("\n")
+        return "".join(parts)
 
     @staticmethod
-    def _extract_from_excel(file_path: str) -> str:
+    def _iter_xlsx_rows(source: Union[str, bytes]) -> Iterator[Tuple[str, Iterator[tuple]]]:
+        """(sheet name, row iterator) pairs, reading with calamine when installed, else openpyxl in read-only mode"""
         try:
-            excel_file = pd.ExcelFile(file_path)
-            extracted_text = ""
+            from python_calamine import CalamineWorkbook
+        except ImportError:
+            CalamineWorkbook = None
 
-            for sheet_name in excel_file.sheet_names:
-                df = pd.read_excel(file_path, sheet_name=sheet_name)
+        if CalamineWorkbook is not None:
+            if isinstance(source, bytes):
+                workbook = CalamineWorkbook.from_filelike(io.BytesIO(source))
+            else:
+                workbook = CalamineWorkbook.from_path(source)
+            for sheet_name in workbook.sheet_names:
+                yield sheet_name, workbook.get_sheet_by_name(sheet_name).iter_rows()
+            return
 
-                extracted_text += f"\n--- SHEET: {sheet_name} ---\n\n"
+        workbook = openpyxl.load_workbook(TextExtractor._as_file(source), read_only=True, data_only=True)
+        try:
+            for worksheet in workbook.worksheets:
+                # Some writers store a wrong sheet size; read whatever rows are there
+                worksheet.reset_dimensions()
+                yield worksheet.title, worksheet.iter_rows(values_only=True)
+        finally:
+            workbook.close()
 
-                if not df.empty:
-                    headers = " | ".join(
-                        str(col) for col in df.columns if pd.notna(col)
+    @staticmethod
+    def _iter_excel_streaming(source: Union[str, bytes]) -> Iterator[Tuple[str, str, str]]:
+        """
+        Render a large .xlsx row by row with bounded memory, in the same
+        "col: value" format as _render_sheet. Stops early once EXCEL_MAX_ROWS
+        data rows or EXCEL_MAX_CHARS characters have been rendered (0 disables a budget).
+        """
+        max_rows = Config.EXCEL_MAX_ROWS
+        max_chars = Config.EXCEL_MAX_CHARS
+        rows_used = 0
+        chars_used = 0
+
+        try:
+            for sheet_name, rows in TextExtractor._iter_xlsx_rows(source):
+                parts = [f"\n--- SHEET: {sheet_name} ---\n\n"]
+                size = 0
+
+                header = list(next(rows, None) or ())
+                while header and TextExtractor._is_blank(header[-1]):
+                    header.pop()
+                columns = [
+                    f"Unnamed: {i}" if TextExtractor._is_blank(name) else str(name)
+                    for i, name in enumerate(header)
+                ]
+                if columns:
+                    parts.append(f"Columns: {' | '.join(columns)}\n\n")
+
+                has_data = False
+                truncated = None
+                for row in rows:
+                    if max_rows and rows_used >= max_rows:
+                        truncated = f"row budget of {max_rows:,} rows"
+                        break
+                    if max_chars and chars_used >= max_chars:
+                        truncated = f"character budget of {max_chars:,} characters"
+                        break
+
+                    rows_used += 1
+                    row_text = " | ".join(
+                        f"{columns[i] if i < len(columns) else f'Unnamed: {i}'}: {TextExtractor._format_cell(value)}"
+                        for i, value in enumerate(row)
+                        if not TextExtractor._is_blank(value)
                     )
-                    if headers.strip():
-                        extracted_text += f"Columns: {headers}\n\n"
-                    for _, row in df.iterrows():
-                        row_text = []
-                        for col_name, value in row.items():
-                            if pd.notna(value) and str(value).strip():
-                                row_text.append(f"{col_name}: {value}")
-
-                        if row_text:
-                            extracted_text += " | ".join(row_text) + "\n"
-
-                    extracted_text += "\n"
-                else:
-                    extracted_text += "Sheet is empty\n\n"
+                    if not row_text:
+                        continue
+
+                    has_data = True
+                    parts.append(row_text + "\n")
+                    size += len(row_text) + 1
+                    chars_used += len(row_text) + 1
+
+                    if size >= TextExtractor.CHUNK_CHARS:
+                        yield "sheet", sheet_name, "".join(parts)
+                        parts = []
+                        size = 0
 
-            if not extracted_text.strip():
-                raise ValueError("No data could be extracted from Excel file")
+                if not has_data and not truncated:
+                    parts.append("Sheet is empty\n")
+                parts.append("\n")
 
-            return extracted_text
+                if truncated:
+                    parts.append(f"[Truncated: {truncated} reached]\n")
+                    yield "sheet", sheet_name, "".join(parts)
+                    return
+
+                yield "sheet", sheet_name, "".join(parts)
 
         except Exception as e:
             raise RuntimeError(f"Error reading Excel file: {str(e)}")
 
+    @staticmethod
+    def _is_blank(value: Any) -> bool:
+        return value is None or not str(value).strip()
+
+    @staticmethod
+    def _format_cell(value: Any) -> str:
+        # calamine returns midnight timestamps as dates and every number as a float;
+        # render them the way openpyxl reports the cell
+        if isinstance(value, date) and not isinstance(value, datetime):
+            value = datetime.combine(value, dt_time.min)
+        elif isinstance(value, float) and value.is_integer():
+            value = int(value)
+        return str(value)
+
     @staticmethod
     def _clean_text(text: str) -> str:
         if not text:
@@ -0,0 +1,135 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+from config import Config
+from .file_service import FileService
+from .text_extractor import TextExtractor
+
+
+def _init_extract_worker() -> None:
+    """Files are already extracted in parallel; a page pool per worker would nest process pools"""
+    Config.PDF_EXTRACT_WORKERS = 1
+
+
+def _extract_upload(source: Union[str, bytes], filename: str) -> Tuple[List[Dict[str, Any]], float]:
+    """Process pool worker: extract one spooled upload, timed where the work happens"""
+    started = time.perf_counter()
+    chunks = list(TextExtractor.iter_text_chunks(source, filename))
+    return chunks, time.perf_counter() - started
+
+
+class UploadPipeline:
+    """
+    Spool every file of a request, extract them concurrently and keep upload order.
+
+    Uploads are held in memory up to UPLOAD_SPOOL_MAX_BYTES and only larger ones
+    are written to (uniquely named) files. Each file is submitted to a process pool
+    as soon as it is spooled, so reading the remaining uploads overlaps with parsing.
+    Single-file requests extract in-process, where large PDFs still get the
+    page-parallel path.
+    """
+
+    @staticmethod
+    def process_files(
+        uploaded_files, select: Optional[Callable[[Iterable[Dict[str, Any]]], str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Spool and extract uploads with a non-empty filename, returning one record per
+        file in upload order: {"filename", "filepath", "text", "text_length",
+        "save_seconds", "extract_seconds"}. filepath is None for uploads kept in memory.
+
+        text is select(chunks) (by default all chunk texts joined) and text_length the
+        full extracted length. Each file's chunks and spooled bytes are released as soon
+        as its text is built, so only one file's chunks are held at a time.
+
+        If any file fails, every spilled file is removed and the first error in upload
+        order is raised; on success the caller owns cleanup().
+        """
+        uploads = [file for file in uploaded_files if file.filename != ""]
+        if not uploads:
+            return []
+
+        cpus = os.cpu_count() or 1
+        workers = min(Config.UPLOAD_EXTRACT_WORKERS or cpus, len(uploads))
+
+        executor = None
+        if workers > 1:
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_extract_worker)
+
+        records = []
+        sources = []
+        futures = []
+        try:
+            for file in uploads:
+                started = time.perf_counter()
+                source, filename = FileService.spool_uploaded_file(file)
+                records.append({
+                    "filename": filename,
+                    "filepath": source if isinstance(source, str) else None,
+                    "save_seconds": time.perf_counter() - started,
+                })
+                if executor:
+                    futures.append(executor.submit(_extract_upload, source, filename))
+                else:
+                    sources.append(source)
+
+            for index, record in enumerate(records):
+                if executor:
+                    chunks, seconds = futures[index].result()
+                    futures[index] = None
+                else:
+                    chunks, seconds = _extract_upload(sources[index], record["filename"])
+                    sources[index] = None
+
+                record.update({
+                    "text": select(chunks) if select else "\n".join(chunk["text"] for chunk in chunks),
+                    "text_length": sum(len(chunk["text"]) for chunk in chunks) + max(0, len(chunks) - 1),
+                    "extract_seconds": seconds,
+                })
+                del chunks
+        except BaseException:
+            UploadPipeline.cleanup(records)
+            raise
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        print(
+            f"Extracted {len(records)} file(s) with {workers} worker(s): "
+            + ", ".join(f"{r['filename']} {r['extract_seconds']:.2f}s" for r in records)
+        )
+        return records
+
+    @staticmethod
+    def combine_text(records: List[Dict[str, Any]], label: str = "FILE", combined_text: str = "") -> str:
+        """
+        Append each file's text to combined_text under a `--- {label}: {filename} ---`
+        header. The per-file texts are removed from the records once combined.
+        """
+        parts = [combined_text] if combined_text else []
+        for record in records:
+            if parts:
+                parts.append(f"\n\n--- {label}: {record['filename']} ---\n\n")
+            else:
+                parts.append(f"--- {label}: {record['filename']} ---\n\n")
+            parts.append(record.pop("text"))
+        return "".join(parts)
+
+    @staticmethod
+    def file_timings(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "filename": record["filename"],
+                "text_length": record["text_length"],
+                "save_seconds": round(record["save_seconds"], 3),
+                "extract_seconds": round(record["extract_seconds"], 3),
+            }
+            for record in records
+        ]
+
+    @staticmethod
+    def cleanup(records: List[Dict[str, Any]]) -> None:
+        for record in records:
+            if record["filepath"]:
+                FileService.cleanup_file(record["filepath"])
@@ -0,0 +1,81 @@
+import ijson
+from typing import Any, BinaryIO, Dict, List, Tuple, Optional
+
+# Canonical metric -> XBRL concepts that report it, highest priority first.
+# Matching is exact on (namespace, tag); substring matching used to pick up
+# unrelated concepts such as AssetsHeldForSale or DerivativeLiabilitiesCurrent.
+CONCEPT_PRIORITIES: Dict[str, List[Tuple[str, str]]] = {
+    "TotalAssets": [
+        ("us-gaap", "Assets"),
+        ("ifrs-full", "Assets"),
+    ],
+    "TotalLiabilities": [
+        ("us-gaap", "Liabilities"),
+        ("ifrs-full", "Liabilities"),
+    ],
+    "Revenues": [
+        ("us-gaap", "Revenues"),
+        ("us-gaap", "RevenueFromContractWithCustomerExcludingAssessedTax"),
+        ("us-gaap", "RevenueFromContractWithCustomerIncludingAssessedTax"),
+        ("us-gaap", "SalesRevenueNet"),
+        ("ifrs-full", "Revenue"),
+    ],
+    "NetIncomeLoss": [
+        ("us-gaap", "NetIncomeLoss"),
+        ("us-gaap", "ProfitLoss"),
+        ("us-gaap", "NetIncomeLossAvailableToCommonStockholdersBasic"),
+        ("ifrs-full", "ProfitLoss"),
+    ],
+    "CashAndCashEquivalents": [
+        ("us-gaap", "CashAndCashEquivalentsAtCarryingValue"),
+        ("us-gaap", "CashCashEquivalentsRestrictedCashAndRestrictedCashEquivalents"),
+        ("us-gaap", "Cash"),
+        ("ifrs-full", "CashAndCashEquivalents"),
+    ],
+}
+
+# (namespace, tag) -> (metric, priority), built once at import time
+CONCEPT_RESOLVER: Dict[Tuple[str, str], Tuple[str, int]] = {
+    concept: (metric, priority)
+    for metric, concepts in CONCEPT_PRIORITIES.items()
+    for priority, concept in enumerate(concepts)
+}
+
+
+def resolve_concept(namespace: str, tag: str) -> Optional[Tuple[str, int]]:
+    """Return (metric, priority) for a tracked XBRL concept, or None"""
+    return CONCEPT_RESOLVER.get((namespace, tag))
+
+
+def stream_tracked_facts(stream: BinaryIO) -> Dict[str, Any]:
+    """
+    Incrementally parse a companyfacts document from a byte stream, materializing
+    only the tracked concepts. Untracked concepts are skipped at the event level,
+    so peak memory does not grow with the size of the filer.
+    """
+    result = {"cik": None, "entityName": None, "facts": {}}
+    builder = None
+    concept_prefix = None
+    concept = None
+
+    for prefix, event, value in ijson.parse(stream, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if event == "end_map" and prefix == concept_prefix:
+                ns, tag = concept
+                result["facts"].setdefault(ns, {})[tag] = builder.value
+                builder = None
+            continue
+
+        if prefix == "cik" and event == "number":
+            result["cik"] = value
+        elif prefix == "entityName" and event == "string":
+            result["entityName"] = value
+        elif event == "map_key" and prefix.startswith("facts.") and prefix.count(".") == 1:
+            candidate = (prefix[len("facts."):], value)
+            if resolve_concept(*candidate) is not None:
+                concept = candidate
+                concept_prefix = f"{prefix}.{value}"
+                builder = ijson.ObjectBuilder()
+
+    return result
@@ -0,0 +1,150 @@
+import pandas as pd
+from typing import Any, Dict, List, Tuple
+from .xbrl_concepts import CONCEPT_PRIORITIES
+
+ANNUAL_FORMS = ("10-K", "10-KT", "20-F", "40-F")
+QUARTERLY_FORMS = ("10-Q",) + ANNUAL_FORMS
+
+FACT_COLUMNS = ["start", "end", "val", "fy", "fp", "form", "filed"]
+HISTORY_FIELDS = ["value", "unit", "start", "end", "fy", "fp", "form", "filed", "tag"]
+
+
+def facts_frame(selected: Dict[str, List[Tuple[str, str, List[Dict[str, Any]]]]]) -> pd.DataFrame:
+    """
+    One row per reported fact for every metric's (tag, unit, entries) candidates,
+    tagged with the metric and the concept's priority within it
+    """
+    frames = []
+    for metric, candidates in selected.items():
+        for priority, (tag, unit, entries) in enumerate(candidates):
+            frame = pd.DataFrame.from_records(entries, columns=FACT_COLUMNS)
+            frame["metric"] = metric
+            frame["tag"] = tag
+            frame["unit"] = unit
+            frame["priority"] = priority
+            frames.append(frame)
+
+    if not frames:
+        return pd.DataFrame(columns=FACT_COLUMNS + ["metric", "tag", "unit", "priority", "value", "days"])
+
+    df = pd.concat(frames, ignore_index=True)
+    df["value"] = pd.to_numeric(df["val"], errors="coerce")
+    df = df.dropna(subset=["value", "end"])
+    df["filed"] = df["filed"].fillna("")
+
+    start = pd.to_datetime(df["start"], format="%Y-%m-%d", errors="coerce")
+    end = pd.to_datetime(df["end"], format="%Y-%m-%d", errors="coerce")
+    df["days"] = (end - start).dt.days
+    return df
+
+
+def latest_facts(df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+    """
+    Most recent fact per metric by (end, filed); filers migrate between concepts
+    over time, so recency wins and concept priority only breaks ties
+    """
+    if df.empty:
+        return {}
+
+    picked = (
+        df.sort_values(["end", "filed", "priority"], ascending=[False, False, True], kind="stable")
+        .groupby("metric", sort=True)
+        .head(1)
+    )
+    return {
+        row["metric"]: {"value": float(row["value"]), "unit": row["unit"], "end": row["end"], "tag": row["tag"]}
+        for row in picked.to_dict("records")
+    }
+
+
+def _dedupe(df: pd.DataFrame, period: pd.Series, frequency: str, history: Dict[str, Any]) -> None:
+    """
+    Keep one fact per (metric, period): the highest-priority concept, and within it
+    the most recently filed value, so restatements replace the originally reported figure
+    """
+    if df.empty:
+        return
+
+    picked = (
+        df.assign(period=period)
+        .sort_values(["priority", "filed"], ascending=[True, False], kind="stable")
+        .groupby(["metric", "period"], sort=True)
+        .head(1)
+        .sort_values(["metric", "period"])
+    )
+
+    for row in picked.to_dict("records"):
+        item = {field: (None if pd.isna(row[field]) else row[field]) for field in HISTORY_FIELDS}
+        if item["fy"] is not None:
+            item["fy"] = int(item["fy"])
+
+        by_frequency = history.setdefault(row["metric"], {"annual": {}, "quarterly": {}})
+        by_frequency[frequency][row["period"]] = item
+
+
+def build_history(df: pd.DataFrame) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """
+    De-duplicated annual and quarterly series per metric.
+
+    Annual values come from 10-K style filings (fiscal period FY), keyed by the
+    calendar year of the period end. Quarterly values are three-month durations
+    or point-in-time balances, keyed by period end date. Instant (balance sheet)
+    facts have no start date and qualify for both.
+    """
+    history = {}
+    if df.empty:
+        return history
+
+    form = df["form"].fillna("").str.replace("/A", "", regex=False)
+    instant = df["start"].isna()
+
+    annual = df[form.isin(ANNUAL_FORMS) & (df["fp"] == "FY") & (instant | df["days"].between(300, 400))]
+    quarterly = df[form.isin(QUARTERLY_FORMS) & (instant | df["days"].between(80, 100))]
+
+    _dedupe(annual, annual["end"].str[:4], "annual", history)
+    _dedupe(quarterly, quarterly["end"], "quarterly", history)
+    return history
+
+
+def select_metric_facts(company_facts_json: Dict[str, Any]) -> Dict[str, List[Tuple[str, str, List[Dict[str, Any]]]]]:
+    """
+    Resolve each key metric to the (tag, unit, entries) candidates present in a
+    companyfacts document, highest-priority concept first
+    """
+    selected = {}
+    facts = company_facts_json.get("facts", {})
+
+    for metric, concepts in CONCEPT_PRIORITIES.items():
+        for ns, tag in concepts:
+            tag_obj = facts.get(ns, {}).get(tag)
+            if not tag_obj:
+                continue
+
+            units = tag_obj.get("units", {})
+            if "USD" in units:
+                chosen_unit = "USD"
+            elif units:
+                chosen_unit = next(iter(units))
+            else:
+                continue
+
+            entries = units.get(chosen_unit, [])
+            if entries:
+                selected.setdefault(metric, []).append((tag, chosen_unit, entries))
+
+    return selected
+
+
+def reduce_company_facts(company_facts_json: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reduce a full companyfacts document to a compact record: the latest value
+    per key metric plus its de-duplicated annual and quarterly history.
+    Pure, so bulk-ingest pool workers can call it without building the lookup service.
+    """
+    facts = facts_frame(select_metric_facts(company_facts_json))
+
+    return {
+        "entity_name": company_facts_json.get("entityName"),
+        "latest": latest_facts(facts),
+        "history": build_history(facts),
+    }
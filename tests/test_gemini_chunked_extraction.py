@@ -0,0 +1,118 @@
+import pytest
+
+from services.gemini_service import GeminiFinancialExtractor
+
+
+@pytest.fixture
+def extractor():
+    # The split/merge helpers don't touch the model, so skip __init__ (and its API key check)
+    return GeminiFinancialExtractor.__new__(GeminiFinancialExtractor)
+
+
+def merge(extractor, *extractions):
+    conflicts = []
+    return extractor._merge_extractions(list(extractions), conflicts), conflicts
+
+
+class TestSplitDocument:
+    def test_short_files_are_packed_into_one_chunk(self, extractor):
+        text = "--- FILE: a.pdf ---\n\nalpha\n\n--- FILE: b.pdf ---\n\nbeta"
+
+        assert extractor._split_document(text, 1000) == [
+            "--- FILE: a.pdf ---\n\nalpha\n\n--- FILE: b.pdf ---\n\nbeta"
+        ]
+
+    def test_files_that_do_not_fit_start_a_new_chunk(self, extractor):
+        text = f"--- FILE: a.pdf ---\n\n{'a' * 60}\n--- FILE: b.pdf ---\n\n{'b' * 60}"
+
+        chunks = extractor._split_document(text, 100)
+
+        assert len(chunks) == 2
+        assert chunks[0].startswith("--- FILE: a.pdf ---") and "b" * 60 not in chunks[0]
+        assert chunks[1].startswith("--- FILE: b.pdf ---") and "a" * 60 not in chunks[1]
+
+    def test_long_file_parts_repeat_the_file_header(self, extractor):
+        lines = [f"line {i:03d} " + "x" * 20 for i in range(40)]
+        text = "--- INVESTMENT FILE: big.xlsx ---\n\n" + "\n".join(lines)
+
+        chunks = extractor._split_document(text, 200)
+
+        assert len(chunks) > 1
+        assert all(chunk.startswith("--- INVESTMENT FILE: big.xlsx ---\n\n") for chunk in chunks)
+        assert [line for chunk in chunks for line in chunk.split("\n")[2:]] == lines
+
+    def test_long_file_is_cut_at_a_section_break(self, extractor):
+        text = "\n".join(["intro " * 10, "more " * 10, "--- SHEET: Balance ---", "assets " * 10])
+
+        chunks = extractor._split_document(text, 150)
+
+        assert chunks[1].startswith("--- SHEET: Balance ---")
+        assert "--- SHEET: Balance ---" not in chunks[0]
+
+    def test_text_without_headers_and_blank_parts(self, extractor):
+        assert extractor._split_document("plain text", 100) == ["plain text"]
+        assert extractor._split_document("--- FILE: empty.pdf ---\n\n\n", 100) == []
+
+
+class TestMergeExtractions:
+    def test_disagreeing_summary_scalars_keep_the_first(self, extractor):
+        merged, conflicts = merge(
+            extractor,
+            {"summerized_data": {"company_name": "Acme LLC"}},
+            {"summerized_data": {"company_name": "Acme"}},
+        )
+
+        assert merged == {"summerized_data": {"company_name": "Acme LLC"}}
+        assert conflicts == [{"field": "summerized_data.company_name", "kept": "Acme LLC", "ignored": "Acme"}]
+
+    def test_placeholders_do_not_override_real_values(self, extractor):
+        merged, conflicts = merge(
+            extractor,
+            {"summerized_data": {"company_name": "N/A", "industry": ""}},
+            {"summerized_data": {"company_name": "Acme", "industry": "Retail"}},
+        )
+
+        assert merged == {"summerized_data": {"company_name": "Acme", "industry": "Retail"}}
+        assert conflicts == []
+
+    def test_zero_yields_to_a_real_figure(self, extractor):
+        merged, conflicts = merge(
+            extractor,
+            {"financial_analysis": {"2023": {"revenue": 0, "net_income": 0}}},
+            {"financial_analysis": {"2023": {"revenue": 1200}}},
+        )
+
+        assert merged == {"financial_analysis": {"2023": {"revenue": 1200, "net_income": 0}}}
+        assert conflicts == []
+
+    def test_only_placeholders_keep_the_first_one(self, extractor):
+        merged, _ = merge(extractor, {"auditor": "N/A"}, {"auditor": "unknown"}, {"auditor": None})
+
+        assert merged == {"auditor": "N/A"}
+
+    def test_conflicting_line_items_are_recorded(self, extractor):
+        merged, conflicts = merge(
+            extractor,
+            {"financial_analysis": {"2022": {"revenue": 100}}},
+            {"financial_analysis": {"2022": {"revenue": 110}}},
+        )
+
+        assert merged["financial_analysis"]["2022"]["revenue"] == 100
+        assert conflicts == [{"field": "financial_analysis.2022.revenue", "kept": 100, "ignored": 110}]
+
+    def test_mixed_shapes_keep_the_first_real_value(self, extractor):
+        merged, conflicts = merge(extractor, {"notes": "-"}, {"notes": "see appendix"}, {"notes": {"a": 1}})
+
+        assert merged == {"notes": "see appendix"}
+        assert conflicts == [{"field": "notes", "kept": "see appendix", "ignored": {"a": 1}}]
+
+    def test_lists_are_concatenated_without_duplicates(self, extractor):
+        merged, _ = merge(extractor, {"risks": ["fx", "debt"]}, {"risks": ["debt", "churn"]})
+
+        assert merged == {"risks": ["fx", "debt", "churn"]}
+
+    def test_booleans_are_not_treated_as_zero(self, extractor):
+        merged, conflicts = merge(extractor, {"audited": False}, {"audited": True})
+
+        assert merged == {"audited": False}
+        assert len(conflicts) == 1